@@ -0,0 +1,43 @@
+import asyncio
+import time
+
+# Bucket da rota de envio de mensagens do Discord (por canal)
+ROUTE_LIMIT = 5
+ROUTE_WINDOW = 5.0
+
+
+# Canal falso: registra cada mensagem e conta envios que o Discord teria limitado
+class FakeChannel:
+    def __init__(self, channel_id, latency_ms=60.0):
+        self.id = channel_id
+        self.name = f"bench-{channel_id}"
+        self.latency = latency_ms / 1000
+        self.messages = []  # (horário de entrega, quantidade de embeds)
+        self.route_violations = 0
+
+    async def send(self, content=None, embed=None, embeds=None):
+        await asyncio.sleep(self.latency)
+        now = time.monotonic()
+        recent = [sent_at for sent_at, _ in self.messages if now - sent_at < ROUTE_WINDOW]
+        if len(recent) >= ROUTE_LIMIT:
+            self.route_violations += 1
+        self.messages.append((now, len(embeds) if embeds else 1))
+
+    @property
+    def embeds_sent(self):
+        return sum(count for _, count in self.messages)
+
+
+# Substituto do discord.Client usado pela fila de notificações
+class FakeDiscordClient:
+    def __init__(self, latency_ms=60.0):
+        self.latency_ms = latency_ms
+        self.channels = {}
+
+    def get_channel(self, channel_id):
+        if channel_id not in self.channels:
+            self.channels[channel_id] = FakeChannel(channel_id, self.latency_ms)
+        return self.channels[channel_id]
+
+    async def fetch_channel(self, channel_id):
+        return self.get_channel(channel_id)
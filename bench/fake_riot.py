@@ -0,0 +1,347 @@
+import asyncio
+import random
+import time
+from aiohttp import web
+
+# Prefixo de plataforma usado nos match IDs de cada região (o bot roteia pelo prefixo)
+ROUTING_PLATFORM = {"americas": "BR1", "europe": "EUW1", "asia": "KR", "sea": "OC1"}
+
+# Limites de uma chave de produção (por região)
+DEFAULT_APP_LIMITS = "500:10,30000:600"
+DEFAULT_METHOD_LIMITS = {
+    "account": "1000:60",
+    "match-ids": "2000:10",
+    "match": "2000:10",
+}
+
+CHAMPIONS = [
+    (1, "Annie"), (9, "FiddleSticks"), (22, "Ashe"), (51, "Caitlyn"), (62, "MonkeyKing"),
+    (64, "LeeSin"), (81, "Ezreal"), (99, "Lux"), (103, "Ahri"), (157, "Yasuo"),
+    (222, "Jinx"), (236, "Lucian"), (412, "Thresh"), (517, "Sylas"), (555, "Pyke"),
+]
+GAME_MODES = ["CLASSIC", "ARAM", "CLASSIC", "CLASSIC", "URF"]
+
+
+# Janela fixa de rate limit, como a da Riot
+class FixedWindow:
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.started = time.monotonic()
+        self.count = 0
+
+    def _roll(self, now):
+        if now - self.started >= self.window:
+            self.started = now
+            self.count = 0
+
+    def retry_after(self, now):
+        self._roll(now)
+        if self.count >= self.limit:
+            return max(1, int(self.window - (now - self.started)) + 1)
+        return 0
+
+    def hit(self, now):
+        self._roll(now)
+        self.count += 1
+
+
+class Limiter:
+    def __init__(self, spec):
+        self.spec = spec
+        self.windows = []
+        for part in spec.split(','):
+            limit, window = part.split(':')
+            self.windows.append(FixedWindow(int(limit), int(window)))
+
+    def retry_after(self, now):
+        return max(window.retry_after(now) for window in self.windows)
+
+    def hit(self, now):
+        for window in self.windows:
+            window.hit(now)
+
+    def count_header(self):
+        return ",".join(f"{window.count}:{window.window}" for window in self.windows)
+
+
+# Partida simulada: grupo de jogadores registrados, início e fim (epoch)
+class FakeMatch:
+    __slots__ = ('match_id', 'party', 'start', 'end', 'game_mode')
+
+    def __init__(self, match_id, party, start, end, game_mode):
+        self.match_id = match_id
+        self.party = party
+        self.start = start
+        self.end = end
+        self.game_mode = game_mode
+
+
+# Grupo de jogadores que sempre jogam juntos (solo = grupo de 1)
+class Party:
+    def __init__(self, puuids, active, rng):
+        self.puuids = puuids
+        self.active = active
+        self.rng = rng
+        self.matches = []
+        self.next_start = None
+
+
+# Servidor local que imita o account-v1 e o match-v5 da Riot: latência, cabeçalhos
+# de rate limit e respostas 429, com partidas geradas conforme o tempo passa
+class FakeRiotAPI:
+    def __init__(self, accounts, active_fraction=0.2, premade_fraction=0.3, game_duration=45.0,
+                 lobby_time=20.0, latency_ms=80.0, service_429_rate=0.002,
+                 app_limits=DEFAULT_APP_LIMITS, method_limits=None, seed=1):
+        self.rng = random.Random(seed)
+        self.game_duration = game_duration
+        self.lobby_time = lobby_time
+        self.latency = latency_ms / 1000
+        self.service_429_rate = service_429_rate
+        self.app_limits = app_limits
+        self.method_limits = method_limits or DEFAULT_METHOD_LIMITS
+        self.limiters = {}
+        self.match_counter = 0
+        self.matches = {}
+        self.parties = {}  # puuid -> Party
+        self.accounts = {}  # (nome, tag) -> puuid
+        self.routing = {}  # puuid -> região
+        self.requests = {}
+        self.rate_limited = {}
+        self.runner = None
+        self.url = None
+        self._build_parties(accounts, active_fraction, premade_fraction)
+
+    # accounts: lista de (puuid, riot_id, tagline, routing)
+    def _build_parties(self, accounts, active_fraction, premade_fraction):
+        now = time.time()
+        by_routing = {}
+        for puuid, riot_id, tagline, routing in accounts:
+            self.accounts[(riot_id.lower(), tagline.lower())] = puuid
+            self.routing[puuid] = routing
+            by_routing.setdefault(routing, []).append(puuid)
+        for routing, puuids in by_routing.items():
+            i = 0
+            while i < len(puuids):
+                size = self.rng.randint(2, 5) if self.rng.random() < premade_fraction else 1
+                party = Party(puuids[i:i + size], self.rng.random() < active_fraction, self.rng)
+                i += size
+                for puuid in party.puuids:
+                    self.parties[puuid] = party
+                # Uma partida antiga no histórico de todo mundo
+                end = now - self.rng.uniform(3600, 5 * 86400)
+                self._add_match(party, routing, end - 1800, end)
+                if party.active:
+                    # Os grupos ativos começam em momentos diferentes
+                    party.next_start = now + self.rng.uniform(-self.game_duration, self.lobby_time)
+
+    def _add_match(self, party, routing, start, end):
+        self.match_counter += 1
+        match_id = f"{ROUTING_PLATFORM[routing]}_{3000000000 + self.match_counter}"
+        match = FakeMatch(match_id, party, start, end, self.rng.choice(GAME_MODES))
+        party.matches.append(match)
+        self.matches[match_id] = match
+        return match
+
+    # Gera as partidas dos grupos ativos até o instante atual
+    def _advance(self, party, now):
+        while party.active and party.next_start is not None and party.next_start <= now:
+            start = party.next_start
+            end = start + self.game_duration * party.rng.uniform(0.8, 1.2)
+            self._add_match(party, self.routing[party.puuids[0]], start, end)
+            party.next_start = end + self.lobby_time * party.rng.uniform(0.5, 1.5)
+
+    def latest_match(self, puuid, now=None):
+        party = self.parties[puuid]
+        now = now or time.time()
+        self._advance(party, now)
+        finished = [match for match in party.matches if match.end <= now]
+        return finished[-1] if finished else None
+
+    def finished_matches(self, since, until):
+        return [match for match in self.matches.values() if since <= match.end <= until]
+
+    def _limiter(self, routing, scope, spec):
+        key = (routing, scope)
+        if key not in self.limiters:
+            self.limiters[key] = Limiter(spec)
+        return self.limiters[key]
+
+    # Aplica latência e rate limits; retorna uma resposta 429 ou None e os cabeçalhos
+    async def _gate(self, routing, method):
+        self.requests[method] = self.requests.get(method, 0) + 1
+        await asyncio.sleep(max(0.0, self.rng.gauss(self.latency, self.latency / 4)))
+
+        now = time.monotonic()
+        app = self._limiter(routing, "app", self.app_limits)
+        method_limiter = self._limiter(routing, method, self.method_limits[method])
+        headers = {}
+
+        for limit_type, limiter in (("application", app), ("method", method_limiter)):
+            retry_after = limiter.retry_after(now)
+            if retry_after:
+                self.rate_limited[limit_type] = self.rate_limited.get(limit_type, 0) + 1
+                return web.json_response(
+                    {"status": {"message": "Rate limit exceeded", "status_code": 429}}, status=429,
+                    headers={"Retry-After": str(retry_after), "X-Rate-Limit-Type": limit_type},
+                ), None
+
+        if self.rng.random() < self.service_429_rate:
+            self.rate_limited["service"] = self.rate_limited.get("service", 0) + 1
+            return web.json_response({"status": {"status_code": 429}}, status=429), None
+
+        app.hit(now)
+        method_limiter.hit(now)
+        headers["X-App-Rate-Limit"] = app.spec
+        headers["X-App-Rate-Limit-Count"] = app.count_header()
+        headers["X-Method-Rate-Limit"] = method_limiter.spec
+        headers["X-Method-Rate-Limit-Count"] = method_limiter.count_header()
+        return None, headers
+
+    async def handle_account(self, request):
+        limited, headers = await self._gate(request.match_info['routing'], "account")
+        if limited:
+            return limited
+        name, tag = request.match_info['name'], request.match_info['tag']
+        puuid = self.accounts.get((name.lower(), tag.lower()))
+        if puuid is None:
+            return web.json_response({"status": {"status_code": 404}}, status=404, headers=headers)
+        return web.json_response({"puuid": puuid, "gameName": name, "tagLine": tag}, headers=headers)
+
+    async def handle_match_ids(self, request):
+        limited, headers = await self._gate(request.match_info['routing'], "match-ids")
+        if limited:
+            return limited
+        party = self.parties.get(request.match_info['puuid'])
+        if party is None:
+            return web.json_response([], headers=headers)
+        now = time.time()
+        self._advance(party, now)
+        start_time = float(request.query.get('startTime', 0))
+        start = int(request.query.get('start', 0))
+        count = min(100, int(request.query.get('count', 20)))
+        match_ids = [
+            match.match_id for match in reversed(party.matches)
+            if match.end <= now and match.start >= start_time
+        ]
+        return web.json_response(match_ids[start:start + count], headers=headers)
+
+    async def handle_match(self, request):
+        limited, headers = await self._gate(request.match_info['routing'], "match")
+        if limited:
+            return limited
+        match = self.matches.get(request.match_info['match_id'])
+        if match is None:
+            return web.json_response({"status": {"status_code": 404}}, status=404, headers=headers)
+        return web.json_response(self.match_payload(match), headers=headers)
+
+    # Payload no formato do match-v5, com os dez participantes completos
+    def match_payload(self, match):
+        rng = random.Random(match.match_id)
+        puuids = list(match.party.puuids)
+        puuids += [f"filler-{match.match_id}-{i}" for i in range(10 - len(puuids))]
+        winning_team = rng.choice((100, 200))
+        participants = []
+        for i, puuid in enumerate(puuids):
+            champion_id, champion_name = rng.choice(CHAMPIONS)
+            team_id = 100 if i < 5 else 200
+            participants.append({
+                "puuid": puuid,
+                "participantId": i + 1,
+                "teamId": team_id,
+                "championId": champion_id,
+                "championName": champion_name,
+                "summonerName": puuid[:16],
+                "riotIdGameName": puuid[:16],
+                "riotIdTagline": "BR1",
+                "kills": rng.randint(0, 20),
+                "deaths": rng.randint(0, 15),
+                "assists": rng.randint(0, 30),
+                "win": team_id == winning_team,
+                "champLevel": rng.randint(10, 18),
+                "goldEarned": rng.randint(5000, 20000),
+                "totalDamageDealtToChampions": rng.randint(5000, 60000),
+                "visionScore": rng.randint(0, 80),
+                **{f"item{slot}": rng.randint(1000, 7000) for slot in range(7)},
+                "challenges": {f"challenge{k}": rng.random() * 100 for k in range(120)},
+                "perks": {
+                    "statPerks": {"defense": 5002, "flex": 5008, "offense": 5005},
+                    "styles": [
+                        {"description": "primaryStyle", "style": 8100,
+                         "selections": [{"perk": 8112 + k, "var1": rng.randint(0, 2000), "var2": 0, "var3": 0} for k in range(4)]},
+                        {"description": "subStyle", "style": 8300,
+                         "selections": [{"perk": 8304 + k, "var1": 0, "var2": 0, "var3": 0} for k in range(2)]},
+                    ],
+                },
+                "missions": {f"playerScore{k}": 0 for k in range(12)},
+            })
+        return {
+            "metadata": {"dataVersion": "2", "matchId": match.match_id, "participants": puuids},
+            "info": {
+                "gameCreation": int(match.start * 1000) - 60000,
+                "gameStartTimestamp": int(match.start * 1000),
+                "gameEndTimestamp": int(match.end * 1000),
+                "gameDuration": int(match.end - match.start),
+                "gameMode": match.game_mode,
+                "gameType": "MATCHED_GAME",
+                "mapId": 11,
+                "queueId": 420,
+                "platformId": match.match_id.split('_')[0],
+                "participants": participants,
+                "teams": [{"teamId": team, "win": team == winning_team, "bans": [], "objectives": {}} for team in (100, 200)],
+            },
+        }
+
+    # Endpoints de controle do benchmark (não existem na API real)
+    async def handle_cursors(self, request):
+        now = time.time()
+        cursors = {}
+        for puuid in self.parties:
+            match = self.latest_match(puuid, now)
+            cursors[puuid] = [match.match_id, match.end] if match else None
+        return web.json_response(cursors)
+
+    async def handle_stats(self, request):
+        since = float(request.query.get('since', 0))
+        now = time.time()
+        for party in set(self.parties.values()):
+            self._advance(party, now)
+        return web.json_response({
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "finished_matches": {match.match_id: match.end for match in self.finished_matches(since, now)},
+        })
+
+    async def start(self, host='127.0.0.1', port=0):
+        app = web.Application()
+        app.router.add_get('/_bench/cursors', self.handle_cursors)
+        app.router.add_get('/_bench/stats', self.handle_stats)
+        app.router.add_get('/{routing}/riot/account/v1/accounts/by-riot-id/{name}/{tag}', self.handle_account)
+        app.router.add_get('/{routing}/lol/match/v5/matches/by-puuid/{puuid}/ids', self.handle_match_ids)
+        app.router.add_get('/{routing}/lol/match/v5/matches/{match_id}', self.handle_match)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    # URL base para o RiotClient de uma região
+    def base_url(self, routing):
+        return f"{self.url}/{routing}"
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+
+# Executa o servidor falso em um processo separado, para não misturar seu custo
+# (CPU e memória) com o do bot medido pelo benchmark
+def serve_in_process(url_queue, accounts, options):
+    async def main():
+        api = FakeRiotAPI(accounts, **options)
+        url_queue.put(await api.start())
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
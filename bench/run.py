@@ -0,0 +1,220 @@
+# Benchmark offline do monitoramento: roda o código real de polling do bot contra uma
+# API da Riot falsa (em outro processo) e um canal do Discord falso.
+#
+# Uso (a partir da raiz do repositório):
+#   python -m bench.run --accounts 1000 --duration 120
+#   python -m bench.run --accounts 10000 --regions americas,europe --interval 60 --json resultado.json
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import aiohttp
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench.fake_discord import FakeDiscordClient  # noqa: E402
+from bench.fake_riot import serve_in_process  # noqa: E402
+
+BENCH_CHANNEL_ID = 1
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark offline do monitoramento de partidas")
+    parser.add_argument("--accounts", type=int, default=1000, help="contas registradas")
+    parser.add_argument("--regions", default="americas", help="regiões de roteamento, separadas por vírgula")
+    parser.add_argument("--duration", type=float, default=120.0, help="duração da medição (segundos)")
+    parser.add_argument("--interval", type=int, default=30, help="intervalo base de monitoramento (segundos)")
+    parser.add_argument("--concurrency", type=int, default=5, help="verificações simultâneas por região")
+    parser.add_argument("--active-fraction", type=float, default=0.2, help="fração de jogadores jogando durante o teste")
+    parser.add_argument("--premade-fraction", type=float, default=0.3, help="fração de grupos de 2 a 5 jogadores")
+    parser.add_argument("--game-duration", type=float, default=45.0, help="duração simulada de uma partida (segundos)")
+    parser.add_argument("--riot-latency-ms", type=float, default=80.0)
+    parser.add_argument("--discord-latency-ms", type=float, default=60.0)
+    parser.add_argument("--app-limits", default="500:10,30000:600", help="rate limit da aplicação por região")
+    parser.add_argument("--service-429-rate", type=float, default=0.002, help="fração de 429 sem Retry-After")
+    parser.add_argument("--cold", action="store_true", help="começa sem cursores (primeira execução do bot)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="salva o relatório neste arquivo")
+    args = parser.parse_args()
+    if args.json:
+        args.json = os.path.abspath(args.json)
+    return args
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def build_accounts(count, regions):
+    return [
+        (f"bench-puuid-{i:06d}", f"jogador{i}", "BENCH", regions[i % len(regions)])
+        for i in range(count)
+    ]
+
+
+async def fetch_json(session, url):
+    async with session.get(url) as response:
+        return await response.json()
+
+
+async def run(args):
+    regions = args.regions.split(',')
+    accounts = build_accounts(args.accounts, regions)
+
+    # API falsa em outro processo
+    url_queue = multiprocessing.Queue()
+    options = {
+        "active_fraction": args.active_fraction,
+        "premade_fraction": args.premade_fraction,
+        "game_duration": args.game_duration,
+        "latency_ms": args.riot_latency_ms,
+        "service_429_rate": args.service_429_rate,
+        "app_limits": args.app_limits,
+        "seed": args.seed,
+    }
+    server = multiprocessing.Process(target=serve_in_process, args=(url_queue, accounts, options), daemon=True)
+    server.start()
+    fake_url = url_queue.get(timeout=60)
+
+    # O bot cria o banco e o cache do Data Dragon no diretório atual
+    os.chdir(tempfile.mkdtemp(prefix="fofoquinhas-bench-"))
+    os.environ.setdefault("RIOT_API_KEY", "bench")
+    import bot
+    from riot_api import RiotClient
+    logging.getLogger().setLevel(logging.WARNING)
+
+    bot.MIN_MATCH_DURATION = args.game_duration * 0.5
+    bot.monitoring_interval = args.interval
+    bot.monitoring_concurrency = args.concurrency
+    bot.notification_channel_id = BENCH_CHANNEL_ID
+    for routing in regions:
+        bot.riot_clients[routing] = RiotClient("bench", routing=routing, base_url=f"{fake_url}/{routing}")
+    discord_client = FakeDiscordClient(args.discord_latency_ms)
+    bot.notifications.client = discord_client
+
+    async with aiohttp.ClientSession() as session:
+        cursors = await fetch_json(session, f"{fake_url}/_bench/cursors")
+
+    # Registro das contas (e cursores, a menos que seja uma partida a frio)
+    for puuid, riot_id, tagline, routing in accounts:
+        bot.registered_accounts[puuid] = {
+            'puuid': puuid, 'riot_id': riot_id, 'tagline': tagline, 'platform': 'bench', 'routing': routing
+        }
+        bot.store.add_account(puuid, riot_id, tagline, 'bench', routing)
+        if not args.cold and cursors.get(puuid):
+            match_id, game_end = cursors[puuid]
+            bot.match_cursors[puuid] = {'match_id': match_id, 'game_end': game_end}
+
+    # Instrumentação do benchmark em volta das funções reais do bot
+    first_poll = {}
+    poll_count = [0]
+    announced = {}
+    monitor_player_matches = bot.monitor_player_matches
+    announce_match = bot.announce_match
+
+    async def timed_monitor_player_matches(puuid):
+        first_poll.setdefault(puuid, time.time())
+        poll_count[0] += 1
+        return await monitor_player_matches(puuid)
+
+    def timed_announce_match(match_summary):
+        announced.setdefault(match_summary.match_id, time.time())
+        return announce_match(match_summary)
+
+    bot.monitor_player_matches = timed_monitor_player_matches
+    bot.announce_match = timed_announce_match
+
+    tracemalloc.start()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.time()
+    bot.notifications.start()
+    bot.monitoring_task = asyncio.create_task(bot.monitor_all_matches())
+
+    await asyncio.sleep(args.duration)
+
+    await bot.stop_monitoring()
+    # Dá tempo para a fila de notificações esvaziar
+    drain_deadline = time.time() + 15
+    while len(bot.notifications) and time.time() < drain_deadline:
+        await asyncio.sleep(0.5)
+    await bot.notifications.stop()
+    finished = time.time()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    async with aiohttp.ClientSession() as session:
+        server_stats = await fetch_json(session, f"{fake_url}/_bench/stats?since={started}")
+    for riot in bot.riot_clients.values():
+        await riot.close()
+    server.terminate()
+
+    # Partidas terminadas durante o teste: detecção (fim -> anúncio) e perdidas
+    ended = server_stats["finished_matches"]
+    detection = [announced[match_id] - end for match_id, end in ended.items() if match_id in announced]
+    # Partidas que terminaram cedo o bastante para terem sido vistas ao menos uma vez
+    missed = [
+        match_id for match_id, end in ended.items()
+        if match_id not in announced and end < started + args.duration - 2 * args.interval
+    ]
+
+    sweep = (max(first_poll.values()) - started) if len(first_poll) == len(accounts) else None
+    delivery = bot.metrics.NOTIFICATION_LATENCY.summary()
+    channel = discord_client.get_channel(BENCH_CHANNEL_ID)
+    requests = server_stats["requests"]
+
+    return {
+        "accounts": len(accounts),
+        "regions": regions,
+        "duration_s": round(finished - started, 1),
+        "interval_s": args.interval,
+        "first_sweep_s": round(sweep, 1) if sweep is not None else None,
+        "accounts_polled": len(first_poll),
+        "polls": poll_count[0],
+        "polls_per_s": round(poll_count[0] / args.duration, 1),
+        "riot_requests": requests,
+        "riot_requests_total": sum(requests.values()),
+        "riot_requests_per_s": round(sum(requests.values()) / args.duration, 1),
+        "riot_429": server_stats["rate_limited"],
+        "matches_finished": len(ended),
+        "matches_announced": len(announced),
+        "matches_missed": len(missed),
+        "detection_latency_s": {
+            "avg": round(sum(detection) / len(detection), 1) if detection else None,
+            "p95": round(percentile(detection, 0.95), 1),
+        },
+        "delivery_latency_s": {"avg": round(delivery["avg"], 2), "p95_le": delivery["p"]},
+        "discord_messages": len(channel.messages),
+        "discord_embeds": channel.embeds_sent,
+        "discord_route_violations": channel.route_violations,
+        "match_cache_size": len(bot.match_cache),
+        "peak_traced_memory_mb": round(peak_memory / 1024 / 1024, 1),
+        "max_rss_mb": round(rss_after / 1024, 1),
+        "max_rss_growth_mb": round((rss_after - rss_before) / 1024, 1),
+    }
+
+
+def main():
+    args = parse_args()
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,23 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import aiohttp
 import os
 import asyncio
+import hashlib
 import json
 from dotenv import load_dotenv
 import logging
-from datetime import datetime, timedelta  # Para expiração de cache
+from datetime import datetime
+from riot_api import NOT_FOUND, RiotClient
+from scheduler import PollScheduler
+from ddragon import DataDragon
+from storage import Store
+from regions import DEFAULT_PLATFORM, PLATFORM_ROUTING, ROUTING_VALUES, account_routing, routing_for_match_id, routing_for_platform
+from match_cache import MatchCache
+from match_summary import MatchSummary
+from notifier import NotificationQueue
+import metrics
+from metrics import DISCOVERY_SKIPPED
 
 # Configurar o logging para capturar erros e informações
 logging.basicConfig(level=logging.INFO)
@@ -18,43 +28,45 @@ load_dotenv()
 DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
 RIOT_API_KEY = os.getenv('RIOT_API_KEY')
 
-# Funções para carregar e salvar contas registradas
-def load_registered_accounts():
-    try:
-        with open('registered_accounts.json', 'r') as file:
-            return json.load(file)
-    except FileNotFoundError:
-        return {}
+# Porta local opcional para expor as métricas no formato do Prometheus
+METRICS_PORT = os.getenv('METRICS_PORT')
 
-def save_registered_accounts(accounts):
-    with open('registered_accounts.json', 'w') as file:
-        json.dump(accounts, file)
+# Armazenamento persistente (SQLite); os arquivos JSON antigos são migrados na primeira execução
+store = Store()
+store.migrate_json()
 
-# Funções para carregar e salvar o canal de notificações
-def load_notification_channel():
-    try:
-        with open('notification_channel.json', 'r') as file:
-            return json.load(file)
-    except FileNotFoundError:
-        return None
+# Inicialização
+registered_accounts = store.load_accounts()
+notification_channel_id = store.get_config('notification_channel_id')
 
-def save_notification_channel(channel_id):
-    with open('notification_channel.json', 'w') as file:
-        json.dump(channel_id, file)
+# Cursor de partidas de cada jogador: último match ID enviado e o fim dessa partida
+# (persistido para não repetir anúncios após reiniciar)
+match_cursors = store.load_last_matches()
 
-# Inicialização
-registered_accounts = load_registered_accounts()
-notification_channel_id = load_notification_channel()
+# Contas migradas dos arquivos JSON: sem cursor, a última partida delas já foi anunciada
+# pela versão antiga, então o cursor é iniciado sem anunciar
+migrated_accounts = set(store.get_config('migrated_accounts', []))
 
-# Cache para resultados de partidas recentes com expiração
-match_cache = {}
-cache_expiration_minutes = 10  # Expira em 10 minutos por padrão
+# Duração mínima de uma partida (remake); antes disso nenhuma partida nova pode ter terminado
+MIN_MATCH_DURATION = 180
 
-# Cache para armazenar o último match ID enviado para cada jogador
-last_match_ids = {}
+# Tamanho máximo de página aceito pelo endpoint de IDs de partidas
+MATCH_IDS_PAGE_SIZE = 100
 
 # Intervalo configurável de monitoramento (em segundos)
-monitoring_interval = 300  # Padrão: 300 segundos
+monitoring_interval = store.get_config('monitoring_interval', 300)  # Padrão: 300 segundos
+
+# Número máximo de jogadores verificados ao mesmo tempo
+monitoring_concurrency = 5
+
+# Número máximo de partidas mantidas no cache de resumos
+match_cache_size = 512
+
+# Intervalo entre snapshots do estado em memória (em segundos)
+SNAPSHOT_INTERVAL = 60
+
+# Versão do formato do snapshot; snapshots de outra versão são ignorados na inicialização
+SNAPSHOT_VERSION = 1
 
 class MyClient(discord.Client):
     def __init__(self):
@@ -64,85 +76,140 @@ class MyClient(discord.Client):
         self.tree = app_commands.CommandTree(self)
 
     async def setup_hook(self):
-        await self.tree.sync()
+        global monitoring_task
+        ddragon.start()
+        if METRICS_PORT:
+            self.metrics_runner = await metrics.start_http_server(int(METRICS_PORT))
+        # O monitoramento começa logo após o login, sem esperar o on_ready nem a sincronização
+        # dos comandos; o estado salvo permite retomar de onde parou
+        notifications.start()
+        monitoring_task = asyncio.create_task(monitor_all_matches(restore_snapshot()))
+        self.snapshot_task = asyncio.create_task(snapshot_loop())
+        self.sync_task = asyncio.create_task(sync_commands_if_changed())
+
+    # Encerramento: primeiro param as verificações, para que nenhuma use as sessões da Riot
+    # ou o banco depois de fechados; o snapshot é salvo já com o estado final
+    async def close(self):
+        await stop_monitoring()
+        if getattr(self, 'sync_task', None):
+            self.sync_task.cancel()
+        if getattr(self, 'snapshot_task', None):
+            self.snapshot_task.cancel()
+            save_snapshot()
+        await notifications.stop()
+        ddragon.stop()
+        for riot in riot_clients.values():
+            await riot.close()
+        await super().close()
+        if getattr(self, 'metrics_runner', None):
+            await self.metrics_runner.cleanup()
+        store.close()
 
 client = MyClient()
 
-# Função para obter informações da conta com base no Riot ID e Tagline, com retry
-async def get_account_info(riot_id, tagline, retries=3):
-    for attempt in range(retries):
-        async with aiohttp.ClientSession() as session:
-            try:
-                url = f"https://americas.api.riotgames.com/riot/account/v1/accounts/by-riot-id/{riot_id}/{tagline}?api_key={RIOT_API_KEY}"
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    elif response.status == 404:
-                        logging.error("Conta não encontrada.")
-                        return None
-                    else:
-                        logging.error(f"Erro ao buscar conta: {response.status}, {await response.text()}")
-            except Exception as e:
-                logging.error(f"Erro durante a chamada à API Riot: {e}")
-        await asyncio.sleep(2)  # Espera 2 segundos antes de tentar novamente
-    return None
+# Um cliente da API da Riot por região de roteamento: cada região tem seu próprio
+# rate limit, sessão HTTP e pool de conexões
+riot_clients = {}
 
-# Função para obter as últimas 2 partidas do jogador, com retry
-async def get_recent_matches(puuid, retries=3):
-    for attempt in range(retries):
-        async with aiohttp.ClientSession() as session:
-            try:
-                url = f"https://americas.api.riotgames.com/lol/match/v5/matches/by-puuid/{puuid}/ids?start=0&count=2&api_key={RIOT_API_KEY}"
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        logging.error(f"Erro ao buscar partidas: {response.status}, {await response.text()}")
-            except Exception as e:
-                logging.error(f"Erro durante a chamada à API Riot: {e}")
-        await asyncio.sleep(2)  # Espera 2 segundos antes de tentar novamente
-    return None
+def get_riot_client(routing):
+    if routing not in riot_clients:
+        riot_clients[routing] = RiotClient(RIOT_API_KEY, routing=routing)
+    return riot_clients[routing]
 
-# Função para obter os detalhes de uma partida, com retry
-async def get_match_details(match_id, retries=3):
-    for attempt in range(retries):
-        async with aiohttp.ClientSession() as session:
-            try:
-                url = f"https://americas.api.riotgames.com/lol/match/v5/matches/{match_id}?api_key={RIOT_API_KEY}"
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        logging.error(f"Erro ao buscar detalhes da partida {match_id}: {response.status}, {await response.text()}")
-            except Exception as e:
-                logging.error(f"Erro durante a chamada à API Riot: {e}")
-        await asyncio.sleep(2)  # Espera 2 segundos antes de tentar novamente
-    return None
+# Fila persistente de notificações para o Discord (agrupadas e enviadas por um worker)
+notifications = NotificationQueue(client, store)
+
+# Cache do Data Dragon (versão do patch e campeões), carregado do disco na inicialização
+ddragon = DataDragon()
+ddragon.load()
+
+# Função para obter informações da conta com base no Riot ID e Tagline
+async def get_account_info(riot_id, tagline, routing="americas"):
+    account = await get_riot_client(account_routing(routing)).get("account-v1.by-riot-id", f"/riot/account/v1/accounts/by-riot-id/{riot_id}/{tagline}")
+    if account is None or account is NOT_FOUND:
+        logging.error("Conta não encontrada.")
+        return None
+    return account
+
+# Função para obter as últimas partidas do jogador (mais recente primeiro)
+async def get_recent_matches(puuid, routing, count=1, start=0, start_time=None):
+    params = {"start": start, "count": count}
+    if start_time is not None:
+        params["startTime"] = int(start_time)
+    match_ids = await get_riot_client(routing).get("match-v5.by-puuid", f"/lol/match/v5/matches/by-puuid/{puuid}/ids", params=params)
+    return [] if match_ids is NOT_FOUND else match_ids
+
+# Função para obter apenas as partidas posteriores ao cursor do jogador, da mais antiga para a mais nova.
+# Retorna None em caso de erro na API
+async def get_new_matches(puuid, routing, cursor):
+    # Jogador sem histórico: só a partida mais recente
+    if cursor is None:
+        return await get_recent_matches(puuid, routing, count=1)
+
+    # Cursor sem horário (migrado): procura o último ID visto na primeira página
+    if cursor['game_end'] is None:
+        match_ids = await get_recent_matches(puuid, routing, count=20)
+        if match_ids is None:
+            return None
+        if cursor['match_id'] in match_ids:
+            match_ids = match_ids[:match_ids.index(cursor['match_id'])]
+        else:
+            match_ids = match_ids[:1]
+        return list(reversed(match_ids))
+
+    # A partida anterior acabou há pouco: nenhuma outra pode ter terminado ainda
+    if datetime.now().timestamp() < cursor['game_end'] + MIN_MATCH_DURATION:
+        DISCOVERY_SKIPPED.inc(routing=routing)
+        return []
+
+    # Só partidas iniciadas depois do fim da última vista, paginando até o fim
+    match_ids = []
+    start = 0
+    while True:
+        page = await get_recent_matches(puuid, routing, count=MATCH_IDS_PAGE_SIZE, start=start, start_time=cursor['game_end'])
+        if page is None:
+            return None
+        match_ids.extend(page)
+        if len(page) < MATCH_IDS_PAGE_SIZE:
+            break
+        start += MATCH_IDS_PAGE_SIZE
+    return [match_id for match_id in reversed(match_ids) if match_id != cursor['match_id']]
+
+# Partida que a API informa não existir (404): tentar de novo não adianta
+class MatchNotFound(Exception):
+    pass
+
+# Função para obter os detalhes de uma partida (a região vem do prefixo do match ID).
+# Retorna NOT_FOUND se a partida não existe e None em caso de erro temporário
+async def get_match_details(match_id):
+    return await get_riot_client(routing_for_match_id(match_id)).get("match-v5.match", f"/lol/match/v5/matches/{match_id}")
+
+# Função para buscar e resumir uma partida (usada pelo cache de partidas)
+async def load_match_summary(match_id):
+    match_data = await get_match_details(match_id)
+    if match_data is NOT_FOUND:
+        raise MatchNotFound(match_id)
+    return MatchSummary.from_match_data(match_id, match_data) if match_data else None
+
+# Cache LRU de resumos de partidas; jogadores na mesma partida compartilham uma única busca
+match_cache = MatchCache(load_match_summary, maxsize=match_cache_size)
 
 # Função para extrair informações relevantes da partida
-async def extract_match_info(match_data, puuid):
-    participants = match_data['info']['participants']
-    player_data = next((player for player in participants if player['puuid'] == puuid), None)
+def extract_match_info(match_summary, puuid):
+    player_data = match_summary.participant(puuid)
 
     if player_data:
-        champion_name = player_data['championName']
-        invoker_name = player_data['summonerName']
-        win_status = "💅 ACHEI FÁCIL" if player_data['win'] else "🤡 KKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKK"
-        game_mode = match_data['info']['gameMode']
-
-        # Obter a versão atual do Data Dragon
-        async with aiohttp.ClientSession() as session:
-            dd_version_url = "https://ddragon.leagueoflegends.com/api/versions.json"
-            async with session.get(dd_version_url) as dd_version_response:
-                if dd_version_response.status == 200:
-                    latest_version = (await dd_version_response.json())[0]
-                else:
-                    latest_version = "12.10.1"  # Fallback para uma versão específica
-
-        champion_image_url = f"http://ddragon.leagueoflegends.com/cdn/{latest_version}/img/champion/{champion_name}.png"
-        kills = player_data['kills']
-        deaths = player_data['deaths']
-        assists = player_data['assists']
+        champion_id = player_data.champion_id
+        champion_name = ddragon.champion_display_name(champion_id, player_data.champion_name)
+        invoker_name = player_data.summoner_name
+        win_status = "💅 ACHEI FÁCIL" if player_data.win else "🤡 KKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKK"
+        game_mode = match_summary.game_mode
+
+        # Imagem do campeão resolvida pelo cache local do Data Dragon (sem chamada de rede)
+        champion_image_url = ddragon.champion_image_url(champion_id, player_data.champion_name)
+        kills = player_data.kills
+        deaths = player_data.deaths
+        assists = player_data.assists
 
         return {
             "champion": champion_name,
@@ -151,80 +218,273 @@ async def extract_match_info(match_data, puuid):
             "image_url": champion_image_url,
             "kda": f"{kills}/{deaths}/{assists}",
             "game_mode": game_mode,
-            "win": player_data['win']
+            "win": player_data.win
         }
     return None
 
-# Função para verificar se o cache expirou
-def has_cache_expired(puuid, match_id):
-    if puuid in match_cache:
-        cache_entry = match_cache[puuid]
-        if cache_entry['match_id'] == match_id and cache_entry['timestamp'] > datetime.now() - timedelta(minutes=cache_expiration_minutes):
-            return False
-    return True
+# Função para montar o embed de uma partida
+def build_match_embed(match_info):
+    embed_color = discord.Color.blue() if match_info['win'] else discord.Color.red()
+
+    # Define o título com base na vitória ou derrota
+    if match_info['win']:
+        title = f"{match_info['invoker']} amassou de {match_info['champion']}"
+    else:
+        title = f"{match_info['invoker']} se fudeu de {match_info['champion']}"
+
+    embed = discord.Embed(
+        title=title,
+        description="saiu do inferno (voltar em breve ass: demonio 👹)",
+        color=embed_color
+    )
+    embed.add_field(
+        name=f"Resultado: {match_info['status']}",
+        value=f"KDA: {match_info['kda']}\n{match_info['game_mode']} de cria",
+        inline=False
+    )
+    embed.set_image(url=match_info['image_url'])
+    return embed
+
+# Função para montar um único embed com todos os jogadores registrados de uma mesma partida
+def build_premade_embed(match_infos):
+    wins = sum(1 for match_info in match_infos if match_info['win'])
+    if wins == len(match_infos):
+        embed_color = discord.Color.blue()
+    elif wins == 0:
+        embed_color = discord.Color.red()
+    else:
+        embed_color = discord.Color.gold()  # jogadores registrados em times opostos
+
+    names = ", ".join(match_info['invoker'] for match_info in match_infos)
+    embed = discord.Embed(
+        title=f"Premade de {len(match_infos)}: {names}",
+        description=f"saíram do inferno juntos (voltar em breve ass: demonio 👹)\n{match_infos[0]['game_mode']} de cria",
+        color=embed_color
+    )
+    for match_info in match_infos:
+        embed.add_field(
+            name=f"{match_info['invoker']} de {match_info['champion']}",
+            value=f"{match_info['status']}\nKDA: {match_info['kda']}",
+            inline=False
+        )
+    embed.set_thumbnail(url=match_infos[0]['image_url'])
+    return embed
+
+# Função para anunciar uma partida uma única vez, com todos os jogadores registrados que participaram
+def announce_match(match_summary):
+    # Verificação e registro sem await no meio: outro jogador da mesma partida não anuncia de novo
+    if store.match_announced(match_summary.match_id):
+        return
+
+    puuids = [participant.puuid for participant in match_summary if participant.puuid in registered_accounts]
+    store.add_match_results(match_summary, puuids)
+    match_infos = [extract_match_info(match_summary, puuid) for puuid in puuids]
+
+    # O envio fica com a fila de notificações, sem travar o monitoramento
+    if notification_channel_id and match_infos:
+        if len(match_infos) == 1:
+            embed = build_match_embed(match_infos[0])
+        else:
+            embed = build_premade_embed(match_infos)
+        notifications.enqueue(notification_channel_id, embed)
+
+# Função para iniciar o cursor de uma conta migrada com a partida mais recente, sem anunciá-la
+async def seed_cursor(puuid, routing):
+    match_ids = await get_recent_matches(puuid, routing, count=1)
+    if match_ids is None:
+        return None  # erro temporário: tenta de novo na próxima verificação
+    if not match_ids:
+        migrated_accounts.discard(puuid)  # sem partidas: a primeira será anunciada normalmente
+        return None
+    match_id = match_ids[0]
+    try:
+        match_summary = await match_cache.get(match_id)
+        if not match_summary:
+            return None
+        game_end = match_summary.game_end
+    except MatchNotFound:
+        game_end = None
+    match_cursors[puuid] = {'match_id': match_id, 'game_end': game_end}
+    store.set_last_match(puuid, match_id, game_end)
+    return game_end
 
 # Função para monitorar as partidas de um jogador
+# Anuncia, em ordem, todas as partidas terminadas desde a última verificação
 async def monitor_player_matches(puuid):
-    global notification_channel_id
-    match_ids = await get_recent_matches(puuid)
-    if match_ids:
-        current_match_id = match_ids[0]
-
-        # Verifica se o último ID de partida enviado é diferente do atual e se o cache expirou
-        if last_match_ids.get(puuid) != current_match_id and has_cache_expired(puuid, current_match_id):
-            last_match_ids[puuid] = current_match_id  # Atualiza o último ID de partida
-            match_cache[puuid] = {"match_id": current_match_id, "timestamp": datetime.now()}  # Atualiza o cache
-
-            match_data = await get_match_details(current_match_id)
-            if match_data:
-                match_info = await extract_match_info(match_data, puuid)
-
-                if match_info:
-                    channel = client.get_channel(notification_channel_id)
-                    if channel:
-                        embed_color = discord.Color.blue() if match_info['win'] else discord.Color.red()
-
-                        # Define o título com base na vitória ou derrota
-                        if match_info['win']:
-                            title = f"{match_info['invoker']} amassou de {match_info['champion']}"
-                        else:
-                            title = f"{match_info['invoker']} se fudeu de {match_info['champion']}"
-
-                        embed = discord.Embed(
-                            title=title,
-                            description="saiu do inferno (voltar em breve ass: demonio 👹)",
-                            color=embed_color
-                        )
-                        embed.add_field(
-                            name=f"Resultado: {match_info['status']}",
-                            value=f"KDA: {match_info['kda']}\n{match_info['game_mode']} de cria",
-                            inline=False
-                        )
-                        embed.set_image(url=match_info['image_url'])
-
-                        await channel.send(embed=embed)
+    routing = registered_accounts[puuid]['routing']
+    cursor = match_cursors.get(puuid)
+    if cursor is None and puuid in migrated_accounts:
+        return await seed_cursor(puuid, routing)
+    match_ids = await get_new_matches(puuid, routing, cursor)
+    last_activity = None
+    for match_id in match_ids or []:
+        try:
+            match_summary = await match_cache.get(match_id)
+        except MatchNotFound:
+            # Partida inexistente na API: o cursor passa por ela (mantendo o horário anterior)
+            # para não travar as partidas seguintes do jogador
+            logging.warning(f"Partida {match_id} não encontrada na API; ignorando")
+            game_end = (match_cursors.get(puuid) or {}).get('game_end')
+            match_cursors[puuid] = {'match_id': match_id, 'game_end': game_end}
+            store.set_last_match(puuid, match_id, game_end)
+            continue
+        if not match_summary:
+            break  # erro temporário: tenta de novo na próxima verificação, sem pular a partida
+
+        # Avança o cursor do jogador
+        game_end = match_summary.game_end
+        match_cursors[puuid] = {'match_id': match_id, 'game_end': game_end}
+        store.set_last_match(puuid, match_id, game_end)
+
+        announce_match(match_summary)
+
+        # Informa ao agendador quando o jogador jogou pela última vez
+        last_activity = game_end or datetime.now().timestamp()
+    return last_activity
+
+# Um pipeline de monitoramento por região: cada uma tem seu agendador, sua concorrência
+# e seu rate limit, então regiões diferentes não disputam o mesmo orçamento.
+# /set_interval altera o intervalo base usado por todos
+schedulers = {}
+scheduler_tasks = {}
+
+def get_scheduler(routing):
+    if routing not in schedulers:
+        schedulers[routing] = PollScheduler(
+            monitor_player_matches, lambda: monitoring_interval, concurrency=monitoring_concurrency, name=routing
+        )
+        # Região nova registrada com o monitoramento já em andamento
+        if monitoring_task is not None:
+            scheduler_tasks[routing] = asyncio.create_task(schedulers[routing].run())
+    return schedulers[routing]
 
 # Função para monitorar todas as contas registradas
-async def monitor_all_matches():
-    global monitoring_interval
+# As verificações são espalhadas ao longo do intervalo e adaptadas à atividade de cada jogador;
+# scheduler_state (do snapshot) mantém o ritmo de cada jogador entre reinícios
+async def monitor_all_matches(scheduler_state=None):
+    accounts_by_routing = {}
+    for puuid, account in registered_accounts.items():
+        accounts_by_routing.setdefault(account['routing'], []).append(puuid)
+    # Sem snapshot, o fim da última partida conhecida já define o ritmo de cada jogador
+    last_activity = {puuid: cursor['game_end'] for puuid, cursor in match_cursors.items() if cursor.get('game_end')}
+    for routing, puuids in accounts_by_routing.items():
+        get_scheduler(routing).add_many(puuids, scheduler_state, last_activity)
+    for routing, scheduler in schedulers.items():
+        if routing not in scheduler_tasks:
+            scheduler_tasks[routing] = asyncio.create_task(scheduler.run())
+    await asyncio.gather(*scheduler_tasks.values())
+
+# Função para parar o monitoramento: cancela os agendadores e as verificações em andamento
+# e espera todos terminarem
+async def stop_monitoring():
+    global monitoring_task
+    tasks = list(scheduler_tasks.values())
+    if monitoring_task is not None:
+        tasks.append(monitoring_task)
+    monitoring_task = None
+    scheduler_tasks.clear()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    # Com os laços parados, nenhuma verificação nova começa; resta cancelar as em andamento
+    await asyncio.gather(*(scheduler.stop() for scheduler in schedulers.values()))
+
+# Função para salvar o estado em memória (agendadores e cache de partidas) no SQLite
+def save_snapshot():
+    scheduler_state = {}
+    for scheduler in schedulers.values():
+        scheduler_state.update(scheduler.snapshot())
+    store.save_snapshot('startup', {
+        'version': SNAPSHOT_VERSION,
+        'schedulers': scheduler_state,
+        'match_cache': [match_summary.to_json() for match_summary in match_cache.entries.values()],
+    })
+
+# Função para restaurar o snapshot: recarrega o cache de partidas e retorna o estado dos agendadores.
+# Um snapshot inválido ou de outro formato é descartado e o bot inicia a frio, sem travar o setup_hook
+def restore_snapshot():
+    try:
+        snapshot = store.load_snapshot('startup')
+        if not snapshot:
+            return None
+        if snapshot.get('version') != SNAPSHOT_VERSION:
+            logging.warning(f"Snapshot na versão {snapshot.get('version')} (esperada {SNAPSHOT_VERSION}); iniciando a frio")
+            store.delete_snapshot('startup')
+            return None
+        match_summaries = [MatchSummary.from_json(data) for data in snapshot['match_cache']]
+        scheduler_state = {}
+        for puuid, (last_activity, games_per_day, next_due) in snapshot['schedulers'].items():
+            scheduler_state[puuid] = [
+                float(last_activity) if last_activity is not None else None, float(games_per_day), float(next_due),
+            ]
+    except Exception as e:
+        logging.error(f"Snapshot inválido, descartado; iniciando a frio: {e}")
+        store.delete_snapshot('startup')
+        return None
+    for match_summary in match_summaries:
+        match_cache.put(match_summary.match_id, match_summary)
+    logging.info(f"Snapshot restaurado: {len(scheduler_state)} jogadores, {len(match_cache)} partidas em cache")
+    return scheduler_state
+
+# Salva o snapshot periodicamente, para que uma queda não perca o estado
+async def snapshot_loop():
     while True:
-        tasks = [monitor_player_matches(puuid) for puuid in registered_accounts]
-        await asyncio.gather(*tasks)
-        await asyncio.sleep(monitoring_interval)  # Intervalo configurável
+        await asyncio.sleep(SNAPSHOT_INTERVAL)
+        try:
+            save_snapshot()
+        except Exception as e:
+            logging.error(f"Erro ao salvar o snapshot: {e}")
+
+# Função para sincronizar os comandos de barra só quando as definições mudaram
+# (a sincronização é lenta e tem rate limit severo no Discord)
+async def sync_commands_if_changed():
+    definitions = sorted(
+        json.dumps(command.to_dict(client.tree), sort_keys=True)
+        for command in client.tree.get_commands()
+    )
+    commands_hash = hashlib.sha256("\n".join(definitions).encode()).hexdigest()
+    if store.get_config('commands_hash') == commands_hash:
+        logging.info("Comandos sem alterações; sincronização ignorada")
+        return
+    try:
+        await client.tree.sync()
+    except discord.HTTPException as e:
+        logging.error(f"Erro ao sincronizar os comandos: {e}")
+        return
+    store.set_config('commands_hash', commands_hash)
+    logging.info("Comandos sincronizados")
 
 # Comando para registrar um jogador
 @client.tree.command(name="registrar", description="Registre um jogador para monitoramento de partidas.")
-async def registrar(interaction: discord.Interaction, riot_id: str, tagline: str):
-    account_info = await get_account_info(riot_id, tagline)
+@app_commands.describe(plataforma="Servidor do jogador (ex.: br1, na1, euw1, kr)", regiao="Região de roteamento (padrão: a da plataforma)")
+@app_commands.choices(
+    plataforma=[app_commands.Choice(name=platform, value=platform) for platform in PLATFORM_ROUTING],
+    regiao=[app_commands.Choice(name=routing, value=routing) for routing in ROUTING_VALUES],
+)
+async def registrar(interaction: discord.Interaction, riot_id: str, tagline: str, plataforma: str = DEFAULT_PLATFORM, regiao: str = None):
+    routing = routing_for_platform(plataforma)
+    if regiao and regiao != routing:
+        await interaction.response.send_message(f"A plataforma {plataforma} pertence à região {routing}, não a {regiao}.")
+        return
+
+    account_info = await get_account_info(riot_id, tagline, routing)
     if account_info:
         puuid = account_info['puuid']
         registered_accounts[puuid] = {
             'riot_id': riot_id,
             'tagline': tagline,
-            'puuid': puuid
+            'puuid': puuid,
+            'platform': plataforma,
+            'routing': routing
         }
-        save_registered_accounts(registered_accounts)
-        await interaction.response.send_message(f"Jogador {riot_id}#{tagline} registrado com sucesso!")
+        store.add_account(puuid, riot_id, tagline, plataforma, routing)
+        # Se o jogador mudou de região, sai do pipeline antigo
+        for other_routing, scheduler in schedulers.items():
+            if other_routing != routing:
+                scheduler.remove(puuid)
+        cursor = match_cursors.get(puuid) or {}
+        get_scheduler(routing).add(puuid, last_activity=cursor.get('game_end'))
+        await interaction.response.send_message(f"Jogador {riot_id}#{tagline} ({plataforma}) registrado com sucesso!")
     else:
         await interaction.response.send_message(f"Não foi possível registrar o jogador {riot_id}#{tagline}. Verifique se o Riot ID e a tagline estão corretos.")
 
@@ -233,7 +493,7 @@ async def registrar(interaction: discord.Interaction, riot_id: str, tagline: str
 async def set_channel(interaction: discord.Interaction):
     global notification_channel_id
     notification_channel_id = interaction.channel.id
-    save_notification_channel(notification_channel_id)
+    store.set_config('notification_channel_id', notification_channel_id)
     await interaction.response.send_message(f"Canal definido para notificações: {interaction.channel.name}")
 
 # Comando para definir o intervalo de monitoramento
@@ -244,6 +504,10 @@ async def set_interval(interaction: discord.Interaction, interval: int):
         await interaction.response.send_message("O intervalo mínimo é de 10 segundos.")
     else:
         monitoring_interval = interval
+        store.set_config('monitoring_interval', interval)
+        # Jogadores já agendados com o intervalo antigo passam a usar o novo
+        for scheduler in schedulers.values():
+            scheduler.reschedule()
         await interaction.response.send_message(f"Intervalo de monitoramento ajustado para {interval} segundos.")
 
 from discord.ext import commands
@@ -253,42 +517,33 @@ from discord.ext import commands
 @commands.has_permissions(administrator=True)  # Verifica se o usuário é administrador
 async def test_embed(interaction: discord.Interaction, riot_id: str, tagline: str):
     # Verificar se o jogador está registrado
-    for puuid, account in registered_accounts.items():
-        if account['riot_id'] == riot_id and account['tagline'] == tagline:
-            # Buscar as últimas partidas do jogador
-            match_ids = await get_recent_matches(puuid)
-            if match_ids:
-                # Pegar o ID da última partida
-                last_match_id = match_ids[0]
-                
-                # Buscar detalhes da última partida
-                match_data = await get_match_details(last_match_id)
-                if match_data:
-                    # Extrair informações da partida
-                    match_info = await extract_match_info(match_data, puuid)
-                    if match_info:
-                        embed_color = discord.Color.blue() if match_info['win'] else discord.Color.red()
-                        title = f"{match_info['invoker']} amassou de {match_info['champion']}" if match_info['win'] else f"{match_info['invoker']} se fudeu de {match_info['champion']}"
-
-                        embed = discord.Embed(
-                            title=title,
-                            description="saiu do inferno (voltar em breve ass: demonio 👹)",
-                            color=embed_color
-                        )
-                        embed.add_field(
-                            name=f"Resultado: {match_info['status']}",
-                            value=f"KDA: {match_info['kda']}\n{match_info['game_mode']} de cria",
-                            inline=False
-                        )
-                        embed.set_image(url=match_info['image_url'])
-
-                        # Enviar o embed com as informações da última partida
-                        await interaction.response.send_message(embed=embed)
-                        return
-
-            # Se não encontrar partidas recentes
-            await interaction.response.send_message(f"Não foi possível encontrar partidas recentes para {riot_id}#{tagline}.")
-            return
+    account = store.find_account(riot_id, tagline)
+    if account:
+        puuid = account['puuid']
+        # Buscar as últimas partidas do jogador
+        match_ids = await get_recent_matches(puuid, account['routing'])
+        if match_ids:
+            # Pegar o ID da última partida
+            last_match_id = match_ids[0]
+            
+            # Buscar detalhes da última partida
+            try:
+                match_summary = await match_cache.get(last_match_id)
+            except MatchNotFound:
+                match_summary = None
+            if match_summary:
+                # Extrair informações da partida
+                match_info = extract_match_info(match_summary, puuid)
+                if match_info:
+                    embed = build_match_embed(match_info)
+
+                    # Enviar o embed com as informações da última partida
+                    await interaction.response.send_message(embed=embed)
+                    return
+
+        # Se não encontrar partidas recentes
+        await interaction.response.send_message(f"Não foi possível encontrar partidas recentes para {riot_id}#{tagline}.")
+        return
 
     # Se o jogador não estiver registrado
     await interaction.response.send_message(f"O jogador {riot_id}#{tagline} não está registrado.")
@@ -299,10 +554,71 @@ async def test_embed_error(interaction: discord.Interaction, error):
     if isinstance(error, commands.MissingPermissions):
         await interaction.response.send_message("Você não tem permissão para usar este comando. Apenas administradores podem utilizá-lo.")
 
-# Evento que inicia o monitoramento após o bot ser ativado
+# Função para montar o resumo das métricas mostrado pelo /stats
+def build_stats_embed():
+    embed = discord.Embed(title="📊 Estatísticas do monitoramento", color=discord.Color.dark_grey())
+
+    lines = []
+    for labels in sorted(metrics.RIOT_REQUEST_LATENCY.values):
+        labels = dict(labels)
+        summary = metrics.RIOT_REQUEST_LATENCY.summary(**labels)
+        lines.append(
+            f"`{labels['routing']}` {labels['endpoint']}: {summary['count']} chamadas, "
+            f"média {summary['avg'] * 1000:.0f}ms, p95 ≤ {summary['p'] * 1000:.0f}ms"
+        )
+    lines.append(f"429: {metrics.RIOT_RATE_LIMITED.total()} · novas tentativas: {metrics.RIOT_RETRIES.total()}")
+    embed.add_field(name="API da Riot", value="\n".join(lines), inline=False)
+
+    hits = metrics.CACHE_LOOKUPS.get(cache="match", result="hit") + metrics.CACHE_LOOKUPS.get(cache="match", result="coalesced")
+    lookups = hits + metrics.CACHE_LOOKUPS.get(cache="match", result="miss")
+    hit_rate = f"{hits / lookups:.0%}" if lookups else "—"
+    embed.add_field(
+        name="Caches",
+        value=f"Partidas: {hit_rate} de acerto ({lookups} consultas, {len(match_cache)} em cache)\n"
+              f"Buscas evitadas pelo cursor: {metrics.DISCOVERY_SKIPPED.total()}",
+        inline=False
+    )
+
+    lines = []
+    for routing, scheduler in schedulers.items():
+        duration = metrics.POLL_DURATION.summary(routing=routing)
+        lag = metrics.POLL_LAG.summary(routing=routing)
+        lines.append(
+            f"`{routing}` {len(scheduler.players)} jogadores, {duration['count']} verificações, "
+            f"duração média {duration['avg']:.1f}s, atraso p95 ≤ {lag['p']:.0f}s, "
+            f"fila {metrics.SCHEDULER_QUEUE_DEPTH.get(routing=routing)}"
+        )
+    embed.add_field(name=f"Monitoramento (intervalo base {monitoring_interval}s)", value="\n".join(lines) or "—", inline=False)
+
+    delivery = metrics.NOTIFICATION_LATENCY.summary()
+    embed.add_field(
+        name="Discord",
+        value=f"Envios: {metrics.DISCORD_SENDS.get(result='ok')} ok, "
+              f"{metrics.DISCORD_SENDS.total() - metrics.DISCORD_SENDS.get(result='ok')} com erro\n"
+              f"Fila: {metrics.NOTIFICATION_QUEUE_DEPTH.get()} · entrega p95 ≤ {delivery['p']:.0f}s",
+        inline=False
+    )
+    return embed
+
+# Comando para ver as métricas do monitoramento (apenas administradores)
+@client.tree.command(name="stats", description="Mostra as métricas do monitoramento de partidas.")
+@app_commands.default_permissions(administrator=True)
+@app_commands.checks.has_permissions(administrator=True)
+async def stats(interaction: discord.Interaction):
+    await interaction.response.send_message(embed=build_stats_embed(), ephemeral=True)
+
+@stats.error
+async def stats_error(interaction: discord.Interaction, error):
+    if isinstance(error, app_commands.MissingPermissions):
+        await interaction.response.send_message("Você não tem permissão para usar este comando. Apenas administradores podem utilizá-lo.", ephemeral=True)
+
+# Tarefa de monitoramento, iniciada no setup_hook
+monitoring_task = None
+
 @client.event
 async def on_ready():
     logging.info(f"Logado como {client.user}")
-    asyncio.create_task(monitor_all_matches())
 
-client.run(DISCORD_TOKEN)
+# Só conecta ao Discord quando executado diretamente (o benchmark importa este módulo)
+if __name__ == "__main__":
+    client.run(DISCORD_TOKEN)
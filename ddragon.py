@@ -0,0 +1,116 @@
+import aiohttp
+import asyncio
+import json
+import logging
+import os
+import time
+
+DDRAGON_URL = "https://ddragon.leagueoflegends.com"
+
+# Versão usada enquanto nenhum dado do Data Dragon foi carregado
+FALLBACK_VERSION = "14.19.1"
+
+# Intervalo entre verificações de novo patch (em segundos)
+REFRESH_INTERVAL = 6 * 60 * 60
+
+
+# Cache local do Data Dragon: versão atual e metadados dos campeões, salvos em disco
+# e atualizados em segundo plano quando um novo patch é lançado
+class DataDragon:
+    def __init__(self, path='ddragon_cache.json', locale='en_US'):
+        self.path = path
+        self.locale = locale
+        self.version = None
+        self.champions = {}  # key numérica (ex.: "9") -> {"id": "FiddleSticks", "name": "Fiddlesticks"}
+        self.champion_ids = {}  # championName da partida -> id do asset
+        self.checked_at = 0.0  # última verificação de novo patch (epoch)
+        self._task = None
+
+    # Carrega o cache salvo em disco (sem acesso à rede)
+    def load(self):
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        self._set(data.get('version'), data.get('champions', {}))
+        self.checked_at = data.get('checked_at', 0.0)
+        return self.version is not None
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump({'version': self.version, 'champions': self.champions, 'checked_at': self.checked_at}, file)
+        os.replace(tmp_path, self.path)
+
+    def _set(self, version, champions):
+        self.version = version
+        self.champions = champions
+        self.champion_ids = {}
+        for champion in champions.values():
+            self.champion_ids[champion['id'].lower()] = champion['id']
+            self.champion_ids[champion['name'].lower()] = champion['id']
+
+    # Busca a versão mais recente e, se mudou, os metadados dos campeões
+    async def refresh(self, session):
+        async with session.get(f"{DDRAGON_URL}/api/versions.json") as response:
+            response.raise_for_status()
+            latest_version = (await response.json())[0]
+        self.checked_at = time.time()
+        if latest_version == self.version and self.champions:
+            self.save()
+            return False
+
+        url = f"{DDRAGON_URL}/cdn/{latest_version}/data/{self.locale}/champion.json"
+        async with session.get(url) as response:
+            response.raise_for_status()
+            data = (await response.json())['data']
+        champions = {
+            champion['key']: {'id': champion['id'], 'name': champion['name']}
+            for champion in data.values()
+        }
+        self._set(latest_version, champions)
+        self.save()
+        logging.info(f"Data Dragon atualizado para a versão {latest_version}")
+        return True
+
+    async def _refresh_loop(self):
+        # Cache recente no disco (ex.: reinício rápido): espera até a próxima verificação
+        remaining = self.checked_at + REFRESH_INTERVAL - time.time()
+        if self.champions and remaining > 0:
+            await asyncio.sleep(remaining)
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+            while True:
+                try:
+                    await self.refresh(session)
+                except Exception as e:
+                    logging.error(f"Erro ao atualizar o Data Dragon: {e}")
+                await asyncio.sleep(REFRESH_INTERVAL)
+
+    # Inicia a atualização em segundo plano (imediata se o cache em disco estiver vencido)
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    # Resolve o id do asset do campeão (ex.: championName "Fiddlesticks" -> "FiddleSticks")
+    def champion_asset_id(self, champion_id=None, champion_name=None):
+        champion = self.champions.get(str(champion_id)) if champion_id is not None else None
+        if champion:
+            return champion['id']
+        if champion_name:
+            return self.champion_ids.get(champion_name.lower(), champion_name)
+        return None
+
+    def champion_display_name(self, champion_id=None, champion_name=None):
+        champion = self.champions.get(str(champion_id)) if champion_id is not None else None
+        return champion['name'] if champion else champion_name
+
+    def champion_image_url(self, champion_id=None, champion_name=None):
+        asset_id = self.champion_asset_id(champion_id, champion_name)
+        version = self.version or FALLBACK_VERSION
+        return f"{DDRAGON_URL}/cdn/{version}/img/champion/{asset_id}.png"
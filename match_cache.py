@@ -0,0 +1,55 @@
+import asyncio
+from collections import OrderedDict
+from metrics import CACHE_LOOKUPS
+
+
+# Cache LRU limitado de resumos de partidas, com deduplicação de buscas em andamento:
+# várias chamadas simultâneas para o mesmo match ID compartilham uma única requisição
+class MatchCache:
+    def __init__(self, loader, maxsize=512, name="match"):
+        self.name = name
+        self.loader = loader  # async loader(match_id) -> resumo da partida ou None
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.in_flight = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def put(self, match_id, summary):
+        self.entries[match_id] = summary
+        self.entries.move_to_end(match_id)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    async def get(self, match_id):
+        summary = self.entries.get(match_id)
+        if summary is not None:
+            self.entries.move_to_end(match_id)
+            CACHE_LOOKUPS.inc(cache=self.name, result="hit")
+            return summary
+
+        future = self.in_flight.get(match_id)
+        if future is not None:
+            CACHE_LOOKUPS.inc(cache=self.name, result="coalesced")
+            return await asyncio.shield(future)
+
+        CACHE_LOOKUPS.inc(cache=self.name, result="miss")
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[match_id] = future
+        try:
+            summary = await self.loader(match_id)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # evita o aviso de exceção não recuperada quando ninguém mais espera
+            raise
+        else:
+            if summary is not None:
+                self.put(match_id, summary)
+            future.set_result(summary)
+            return summary
+        finally:
+            del self.in_flight[match_id]
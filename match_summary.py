@@ -0,0 +1,68 @@
+import sys
+from typing import NamedTuple, Optional
+
+
+# Dados de um participante usados pelos embeds (tupla imutável, sem __dict__)
+class ParticipantSummary(NamedTuple):
+    puuid: str
+    champion_id: Optional[int]
+    champion_name: str
+    summoner_name: str
+    kills: int
+    deaths: int
+    assists: int
+    win: bool
+
+
+# Resumo compacto de uma partida do match-v5, montado uma vez por partida.
+# Guarda só os campos usados pelo bot e um índice por PUUID para acesso O(1)
+class MatchSummary:
+    __slots__ = ('match_id', 'game_mode', 'game_end', 'participants', '_index')
+
+    def __init__(self, match_id, game_mode, game_end, participants):
+        self.match_id = match_id
+        self.game_mode = game_mode
+        self.game_end = game_end
+        self.participants = tuple(participants)
+        self._index = {participant.puuid: i for i, participant in enumerate(self.participants)}
+
+    @classmethod
+    def from_match_data(cls, match_id, match_data):
+        info = match_data['info']
+        participants = [
+            ParticipantSummary(
+                player['puuid'],
+                player.get('championId'),
+                sys.intern(player['championName']),
+                player.get('summonerName') or player.get('riotIdGameName', ''),
+                player['kills'],
+                player['deaths'],
+                player['assists'],
+                bool(player['win']),
+            )
+            for player in info['participants']
+        ]
+        game_end = info.get('gameEndTimestamp', 0) / 1000 or None
+        return cls(match_id, sys.intern(info['gameMode']), game_end, participants)
+
+    # Formato serializável (listas) usado no snapshot de inicialização
+    def to_json(self):
+        return [self.match_id, self.game_mode, self.game_end, [list(participant) for participant in self.participants]]
+
+    @classmethod
+    def from_json(cls, data):
+        match_id, game_mode, game_end, participants = data
+        return cls(match_id, sys.intern(game_mode), game_end, [
+            ParticipantSummary(puuid, champion_id, sys.intern(champion_name), *rest)
+            for puuid, champion_id, champion_name, *rest in participants
+        ])
+
+    def participant(self, puuid):
+        i = self._index.get(puuid)
+        return self.participants[i] if i is not None else None
+
+    def __iter__(self):
+        return iter(self.participants)
+
+    def __repr__(self):
+        return f"MatchSummary({self.match_id!r}, {self.game_mode!r}, {len(self.participants)} participantes)"
@@ -0,0 +1,185 @@
+import bisect
+import logging
+from aiohttp import web
+
+# Limites dos histogramas de latência (em segundos)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+POLL_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.values = {}
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels):
+        return self.values.get(_label_key(labels), 0)
+
+    def total(self):
+        return sum(self.values.values())
+
+    def samples(self):
+        for key, value in self.values.items():
+            yield self.name, key, value
+
+
+# Gauge com valor definido manualmente ou calculado na hora da coleta (callback)
+class Gauge:
+    type = "gauge"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.values = {}
+        self.callbacks = {}
+
+    def set(self, value, **labels):
+        self.values[_label_key(labels)] = value
+
+    def set_function(self, fn, **labels):
+        self.callbacks[_label_key(labels)] = fn
+
+    def get(self, **labels):
+        key = _label_key(labels)
+        if key in self.callbacks:
+            return self.callbacks[key]()
+        return self.values.get(key, 0)
+
+    def samples(self):
+        for key, value in self.values.items():
+            yield self.name, key, value
+        for key, fn in self.callbacks.items():
+            try:
+                yield self.name, key, fn()
+            except Exception as e:
+                logging.error(f"Erro ao coletar a métrica {self.name}: {e}")
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.values = {}  # labels -> [contagem por bucket..., +Inf], soma
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        entry = self.values.get(key)
+        if entry is None:
+            entry = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    # Contagem, média e percentil aproximado (limite superior do bucket) para um conjunto de labels,
+    # ou somando todos os labels quando nenhum é informado
+    def summary(self, quantile=0.95, **labels):
+        if labels:
+            entries = [self.values[key] for key in (_label_key(labels),) if key in self.values]
+        else:
+            entries = list(self.values.values())
+        counts = [sum(entry[0][i] for entry in entries) for i in range(len(self.buckets) + 1)]
+        count = sum(counts)
+        total = sum(entry[1] for entry in entries)
+        if count == 0:
+            return {"count": 0, "avg": 0.0, "p": 0.0}
+        target = quantile * count
+        cumulative = 0
+        percentile = float('inf')
+        for i, bucket_count in enumerate(counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                percentile = self.buckets[i] if i < len(self.buckets) else float('inf')
+                break
+        return {"count": count, "avg": total / count, "p": percentile}
+
+    def samples(self):
+        for key, (counts, total) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float('inf') else repr(bound)
+                yield f"{self.name}_bucket", key + (('le', le),), cumulative
+            yield f"{self.name}_sum", key, total
+            yield f"{self.name}_count", key, cumulative
+
+
+# Conjunto de métricas do bot, exportado no formato de texto do Prometheus
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, key, value in metric.samples():
+                lines.append(f"{name}{_format_labels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# Chamadas à API da Riot
+RIOT_REQUEST_LATENCY = REGISTRY.register(Histogram("riot_request_duration_seconds", "Latência das chamadas à API da Riot por endpoint"))
+RIOT_REQUESTS = REGISTRY.register(Counter("riot_requests_total", "Respostas da API da Riot por endpoint e status"))
+RIOT_RETRIES = REGISTRY.register(Counter("riot_retries_total", "Novas tentativas de chamadas à API da Riot por endpoint e motivo"))
+RIOT_RATE_LIMITED = REGISTRY.register(Counter("riot_rate_limited_total", "Respostas 429 da API da Riot por endpoint e tipo de limite"))
+RIOT_THROTTLE_WAIT = REGISTRY.register(Histogram("riot_throttle_wait_seconds", "Tempo de espera nos baldes de rate limit antes de cada chamada"))
+
+# Caches
+CACHE_LOOKUPS = REGISTRY.register(Counter("cache_lookups_total", "Consultas aos caches por cache e resultado (hit, miss, coalesced)"))
+DISCOVERY_SKIPPED = REGISTRY.register(Counter("match_discovery_skipped_total", "Verificações em que o cursor dispensou a chamada à API"))
+
+# Monitoramento
+POLL_DURATION = REGISTRY.register(Histogram("poll_duration_seconds", "Duração da verificação de um jogador por região", POLL_BUCKETS))
+POLL_LAG = REGISTRY.register(Histogram("poll_lag_seconds", "Atraso entre o horário agendado e o início da verificação por região", POLL_BUCKETS))
+POLLS = REGISTRY.register(Counter("polls_total", "Verificações de jogadores por região e resultado"))
+SCHEDULER_QUEUE_DEPTH = REGISTRY.register(Gauge("scheduler_queue_depth", "Jogadores com verificação vencida aguardando vaga, por região"))
+SCHEDULER_IN_FLIGHT = REGISTRY.register(Gauge("scheduler_in_flight", "Verificações em andamento por região"))
+
+# Discord
+DISCORD_SEND_LATENCY = REGISTRY.register(Histogram("discord_send_duration_seconds", "Latência dos envios de mensagens ao Discord"))
+DISCORD_SENDS = REGISTRY.register(Counter("discord_sends_total", "Envios ao Discord por resultado"))
+NOTIFICATION_LATENCY = REGISTRY.register(Histogram("notification_delivery_seconds", "Tempo entre enfileirar e entregar uma notificação", POLL_BUCKETS))
+NOTIFICATION_QUEUE_DEPTH = REGISTRY.register(Gauge("notification_queue_depth", "Notificações aguardando envio ao Discord"))
+
+
+async def _handle_metrics(request):
+    return web.Response(text=REGISTRY.render(), content_type="text/plain", charset="utf-8")
+
+
+# Servidor HTTP local (opcional) que expõe /metrics para o Prometheus
+async def start_http_server(port, host='127.0.0.1'):
+    app = web.Application()
+    app.router.add_get('/metrics', _handle_metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logging.info(f"Métricas disponíveis em http://{host}:{port}/metrics")
+    return runner
@@ -0,0 +1,151 @@
+import asyncio
+import discord
+import json
+import logging
+import time
+from metrics import DISCORD_SEND_LATENCY, DISCORD_SENDS, NOTIFICATION_LATENCY, NOTIFICATION_QUEUE_DEPTH
+from riot_api import SlidingWindow
+
+# Limites de uma mensagem do Discord
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+# Limite da rota POST /channels/{id}/messages: 5 mensagens a cada 5 segundos por canal
+CHANNEL_MESSAGE_LIMIT = (5, 5)
+
+# Tempo de espera para juntar notificações num mesmo envio (em segundos)
+BATCH_LINGER = 2.0
+
+# Espera máxima entre tentativas de envio para um canal (em segundos)
+MAX_RETRY_DELAY = 300
+
+
+# Fila de notificações para o Discord, persistida no SQLite.
+# O monitoramento só enfileira; um worker agrupa e envia respeitando os rate limits
+class NotificationQueue:
+    def __init__(self, client, store):
+        self.client = client
+        self.store = store
+        self.windows = {}
+        self.retry_at = {}  # canal -> horário da próxima tentativa após falha
+        self._wakeup = asyncio.Event()
+        self._task = None
+        NOTIFICATION_QUEUE_DEPTH.set_function(store.count_notifications)
+
+    def __len__(self):
+        return self.store.count_notifications()
+
+    def enqueue(self, channel_id, embed):
+        self.store.add_notification(channel_id, json.dumps(embed.to_dict()))
+        self._wakeup.set()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _window(self, channel_id):
+        if channel_id not in self.windows:
+            self.windows[channel_id] = SlidingWindow(*CHANNEL_MESSAGE_LIMIT)
+        return self.windows[channel_id]
+
+    # Agrupa as notificações pendentes em mensagens de até 10 embeds por canal
+    @staticmethod
+    def _batches(rows):
+        by_channel = {}
+        for row in rows:
+            by_channel.setdefault(row['channel_id'], []).append(row)
+        for channel_id, channel_rows in by_channel.items():
+            batch, chars = [], 0
+            for row in channel_rows:
+                embed = discord.Embed.from_dict(json.loads(row['payload']))
+                if batch and (len(batch) == MAX_EMBEDS_PER_MESSAGE or chars + len(embed) > MAX_EMBED_CHARS_PER_MESSAGE):
+                    yield channel_id, batch
+                    batch, chars = [], 0
+                batch.append((row['id'], embed, row['created_at']))
+                chars += len(embed)
+            if batch:
+                yield channel_id, batch
+
+    async def _get_channel(self, channel_id):
+        channel = self.client.get_channel(channel_id)
+        if channel is None:
+            channel = await self.client.fetch_channel(channel_id)
+        return channel
+
+    async def _send(self, channel_id, batch):
+        ids = [notification_id for notification_id, _, _ in batch]
+        window = self._window(channel_id)
+        while (wait := window.wait_time(time.monotonic())) > 0:
+            await asyncio.sleep(wait)
+        window.consume(time.monotonic())
+        start = time.perf_counter()
+        try:
+            channel = await self._get_channel(channel_id)
+            await channel.send(embeds=[embed for _, embed, _ in batch])
+        except (discord.NotFound, discord.Forbidden) as e:
+            DISCORD_SENDS.inc(result="dropped")
+            # Canal apagado ou sem permissão: tentar de novo não adianta
+            logging.error(f"Descartando {len(ids)} notificações para o canal {channel_id}: {e}")
+            self.store.delete_notifications(ids)
+        except discord.HTTPException as e:
+            DISCORD_SENDS.inc(result="rate_limited" if e.status == 429 else "error")
+            logging.error(f"Erro ao enviar notificações para o canal {channel_id}: {e}")
+            if e.status == 429:
+                window.block(float(getattr(e, 'retry_after', 5)), time.monotonic())
+            self._fail(channel_id, ids)
+            return False
+        except Exception as e:
+            DISCORD_SENDS.inc(result="error")
+            logging.error(f"Erro ao enviar notificações para o canal {channel_id}: {e}")
+            self._fail(channel_id, ids)
+            return False
+        else:
+            DISCORD_SENDS.inc(result="ok")
+            DISCORD_SEND_LATENCY.observe(time.perf_counter() - start)
+            now = time.time()
+            for _, _, created_at in batch:
+                NOTIFICATION_LATENCY.observe(now - created_at)
+            self.store.delete_notifications(ids)
+            self.retry_at.pop(channel_id, None)
+        return True
+
+    # Envia os lotes de um canal em ordem, parando na primeira falha
+    async def _send_channel(self, channel_id, batches):
+        for batch in batches:
+            if not await self._send(channel_id, batch):
+                return
+
+    # Falhas temporárias (queda do Discord, 5xx, 429): as notificações ficam na fila até
+    # serem entregues, com espera exponencial entre as tentativas
+    def _fail(self, channel_id, ids):
+        attempts = self.store.mark_notifications_failed(ids)
+        self.retry_at[channel_id] = time.monotonic() + min(MAX_RETRY_DELAY, 2 ** attempts)
+
+    async def _run(self):
+        while True:
+            # Canais em espera após falha ficam de fora da consulta, para não esconderem
+            # as notificações mais novas dos outros canais
+            now = time.monotonic()
+            waiting = [channel_id for channel_id, retry_at in self.retry_at.items() if retry_at > now]
+            rows = self.store.pending_notifications(exclude_channels=waiting)
+            if not rows:
+                self._wakeup.clear()
+                timeout = min((t - now for t in self.retry_at.values() if t > now), default=None)
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                # Espera um pouco para juntar as notificações de partidas que acabaram juntas
+                await asyncio.sleep(BATCH_LINGER)
+                continue
+
+            by_channel = {}
+            for channel_id, batch in self._batches(rows):
+                by_channel.setdefault(channel_id, []).append(batch)
+            await asyncio.gather(*(self._send_channel(channel_id, batches) for channel_id, batches in by_channel.items()))
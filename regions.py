@@ -0,0 +1,44 @@
+# Roteamento regional da API da Riot: cada plataforma (servidor) pertence a uma região,
+# e os rate limits são aplicados separadamente por região
+
+DEFAULT_PLATFORM = "br1"
+
+# Plataforma -> região de roteamento do match-v5
+PLATFORM_ROUTING = {
+    "br1": "americas",
+    "la1": "americas",
+    "la2": "americas",
+    "na1": "americas",
+    "eun1": "europe",
+    "euw1": "europe",
+    "me1": "europe",
+    "ru": "europe",
+    "tr1": "europe",
+    "jp1": "asia",
+    "kr": "asia",
+    "oc1": "sea",
+    "ph2": "sea",
+    "sg2": "sea",
+    "th2": "sea",
+    "tw2": "sea",
+    "vn2": "sea",
+}
+
+ROUTING_VALUES = sorted(set(PLATFORM_ROUTING.values()))
+
+# O account-v1 não é servido pela região "sea"; contas dessa região são buscadas em "asia"
+ACCOUNT_ROUTING = {"sea": "asia"}
+
+
+def routing_for_platform(platform):
+    return PLATFORM_ROUTING.get(platform.lower())
+
+
+def account_routing(routing):
+    return ACCOUNT_ROUTING.get(routing, routing)
+
+
+# O prefixo do match ID indica a plataforma da partida (ex.: "BR1_2960000000" -> "americas")
+def routing_for_match_id(match_id, default="americas"):
+    platform, _, _ = match_id.partition('_')
+    return PLATFORM_ROUTING.get(platform.lower(), default)
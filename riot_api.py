@@ -0,0 +1,218 @@
+import aiohttp
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from metrics import RIOT_RATE_LIMITED, RIOT_REQUEST_LATENCY, RIOT_REQUESTS, RIOT_RETRIES, RIOT_THROTTLE_WAIT
+
+# Limites padrão de uma chave de desenvolvimento (usados até a API informar os reais)
+DEFAULT_APP_LIMITS = "20:1,100:120"
+DEFAULT_METHOD_LIMITS = "20:1"
+
+# Margem de segurança aplicada aos limites informados pela Riot
+RATE_LIMIT_SAFETY = 0.9
+
+# Retornado por RiotClient.get quando o recurso não existe (404), para diferenciar de uma
+# falha temporária (None)
+NOT_FOUND = object()
+
+
+# Converte um cabeçalho no formato "20:1,100:120" em pares (limite, janela em segundos)
+def parse_rate_limit_header(value):
+    limits = []
+    if not value:
+        return limits
+    for part in value.split(','):
+        try:
+            limit, window = part.strip().split(':')
+            limits.append((int(limit), int(window)))
+        except ValueError:
+            continue
+    return limits
+
+
+# Janela deslizante de rate limit (ex.: 100 requisições a cada 120s): guarda o horário
+# de cada envio e permite no máximo `capacity` envios em quaisquer `window` segundos.
+# Assim nenhuma janela fixa da Riot, seja qual for o seu início, passa do limite
+class SlidingWindow:
+    def __init__(self, limit, window):
+        self.window = window
+        self.sent = deque()  # horários dos envios ainda dentro da janela
+        self.blocked_until = 0.0
+        self.set_limit(limit)
+
+    def set_limit(self, limit):
+        self.limit = limit
+        self.capacity = max(1, int(limit * RATE_LIMIT_SAFETY))
+
+    def _expire(self, now):
+        while self.sent and self.sent[0] <= now - self.window:
+            self.sent.popleft()
+
+    # Tempo (em segundos) até caber mais um envio na janela
+    def wait_time(self, now):
+        self._expire(now)
+        wait = self.blocked_until - now
+        if len(self.sent) >= self.capacity:
+            wait = max(wait, self.sent[-self.capacity] + self.window - now)
+        return max(0.0, wait)
+
+    def consume(self, now):
+        self._expire(now)
+        self.sent.append(now)
+
+    # Sincroniza com a contagem informada pela Riot ("X-...-Rate-Limit-Count"): envios que
+    # não vimos (ex.: outra instância com a mesma chave) passam a contar a partir de agora
+    def sync(self, used, now):
+        self._expire(now)
+        missing = min(used, self.capacity) - len(self.sent)
+        if missing > 0:
+            self.sent.extend([now] * missing)
+
+    # Bloqueia a janela até o fim de um Retry-After
+    def block(self, seconds, now):
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+
+# Conjunto de janelas definido por um cabeçalho de rate limit
+class RateLimit:
+    def __init__(self, header_value):
+        self.windows = {}
+        self.update(header_value)
+
+    def update(self, header_value, count_value=None, now=None):
+        now = time.monotonic() if now is None else now
+        limits = parse_rate_limit_header(header_value)
+        # Janelas que a Riot não informa mais (ex.: os limites padrão iniciais) são descartadas
+        windows = {window for _, window in limits}
+        for window in list(self.windows):
+            if window not in windows:
+                del self.windows[window]
+        for limit, window in limits:
+            sliding_window = self.windows.get(window)
+            if sliding_window is None:
+                self.windows[window] = SlidingWindow(limit, window)
+            elif sliding_window.limit != limit:
+                sliding_window.set_limit(limit)
+        for used, window in parse_rate_limit_header(count_value):
+            sliding_window = self.windows.get(window)
+            if sliding_window is not None:
+                sliding_window.sync(used, now)
+
+    def wait_time(self, now):
+        return max((window.wait_time(now) for window in self.windows.values()), default=0.0)
+
+    def consume(self, now):
+        for window in self.windows.values():
+            window.consume(now)
+
+    def block(self, seconds, now):
+        for window in self.windows.values():
+            window.block(seconds, now)
+
+
+# Cliente único da API da Riot: mantém a sessão HTTP (pool de conexões) e os rate limits
+class RiotClient:
+    def __init__(self, api_key, routing="americas", retries=4, max_connections=20, base_url=None):
+        self.api_key = api_key
+        self.routing = routing
+        self.base_url = base_url or f"https://{routing}.api.riotgames.com"
+        self.retries = retries
+        self.max_connections = max_connections
+        self.session = None
+        self.app_limit = RateLimit(DEFAULT_APP_LIMITS)
+        self.method_limits = {}
+
+    async def _get_session(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"X-Riot-Token": self.api_key},
+                timeout=aiohttp.ClientTimeout(total=15),
+            )
+        return self.session
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    def _method_limit(self, method):
+        if method not in self.method_limits:
+            self.method_limits[method] = RateLimit(DEFAULT_METHOD_LIMITS)
+        return self.method_limits[method]
+
+    # Espera até que o limite da aplicação e o do método permitam mais uma requisição.
+    # A checagem e o consumo não têm await entre si; a espera fica fora de qualquer trava,
+    # então um método limitado não segura as requisições dos outros
+    async def _acquire(self, method):
+        method_limit = self._method_limit(method)
+        start = time.monotonic()
+        while True:
+            now = time.monotonic()
+            wait = max(self.app_limit.wait_time(now), method_limit.wait_time(now))
+            if wait <= 0:
+                self.app_limit.consume(now)
+                method_limit.consume(now)
+                RIOT_THROTTLE_WAIT.observe(now - start, routing=self.routing)
+                return
+            await asyncio.sleep(wait)
+
+    def _update_limits(self, method, headers):
+        if 'X-App-Rate-Limit' in headers:
+            self.app_limit.update(headers['X-App-Rate-Limit'], headers.get('X-App-Rate-Limit-Count'))
+        if 'X-Method-Rate-Limit' in headers:
+            self._method_limit(method).update(headers['X-Method-Rate-Limit'], headers.get('X-Method-Rate-Limit-Count'))
+
+    # Backoff exponencial com jitter ("full jitter")
+    @staticmethod
+    def _backoff(attempt, base=1.0, cap=30.0):
+        return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+    # Faz um GET na API da Riot. Retorna o JSON, NOT_FOUND se o recurso não existe (404)
+    # ou None após esgotar as tentativas
+    async def get(self, method, path, params=None):
+        url = f"{self.base_url}{path}"
+        labels = {"endpoint": method, "routing": self.routing}
+        for attempt in range(self.retries):
+            await self._acquire(method)
+            try:
+                session = await self._get_session()
+                start = time.perf_counter()
+                async with session.get(url, params=params) as response:
+                    self._update_limits(method, response.headers)
+                    if response.status == 200:
+                        data = await response.json()
+                        RIOT_REQUEST_LATENCY.observe(time.perf_counter() - start, **labels)
+                        RIOT_REQUESTS.inc(**labels, status=response.status)
+                        return data
+                    RIOT_REQUEST_LATENCY.observe(time.perf_counter() - start, **labels)
+                    RIOT_REQUESTS.inc(**labels, status=response.status)
+                    if response.status == 404:
+                        return NOT_FOUND
+                    if response.status == 429:
+                        retry_after = response.headers.get('Retry-After')
+                        delay = float(retry_after) if retry_after else self._backoff(attempt)
+                        limit_type = response.headers.get('X-Rate-Limit-Type', 'service')
+                        logging.warning(f"Rate limit ({limit_type}) atingido em {method}, aguardando {delay:.1f}s")
+                        RIOT_RATE_LIMITED.inc(**labels, type=limit_type)
+                        RIOT_RETRIES.inc(**labels, reason="429")
+                        now = time.monotonic()
+                        if limit_type == 'application':
+                            self.app_limit.block(delay, now)
+                        elif limit_type == 'method':
+                            self._method_limit(method).block(delay, now)
+                        else:
+                            await asyncio.sleep(delay)
+                        continue
+                    if response.status in (400, 401, 403):
+                        logging.error(f"Erro na API Riot ({method}): {response.status}, {await response.text()}")
+                        return None
+                    logging.error(f"Erro na API Riot ({method}): {response.status}, {await response.text()}")
+                    RIOT_RETRIES.inc(**labels, reason=str(response.status))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logging.error(f"Erro durante a chamada à API Riot: {e}")
+                RIOT_RETRIES.inc(**labels, reason="network")
+            await asyncio.sleep(self._backoff(attempt))
+        return None
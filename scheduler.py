@@ -0,0 +1,196 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from metrics import POLL_DURATION, POLL_LAG, POLLS, SCHEDULER_IN_FLIGHT, SCHEDULER_QUEUE_DEPTH
+
+# Intervalo mínimo entre verificações de um mesmo jogador (em segundos)
+MIN_POLL_INTERVAL = 10
+
+# Multiplicadores do intervalo base conforme o tempo desde a última partida do jogador
+IDLE_BACKOFF = [
+    (60 * 60, 0.5),           # jogou na última hora: provavelmente vai jogar de novo
+    (6 * 60 * 60, 1.0),
+    (24 * 60 * 60, 2.0),
+    (3 * 24 * 60 * 60, 4.0),
+]
+IDLE_BACKOFF_MAX = 8.0        # parado há dias
+
+# Jogadores com pelo menos essa média de partidas por dia nunca saem do intervalo base
+FREQUENT_PLAYER_GAMES_PER_DAY = 3.0
+
+
+# Estado de agendamento de um jogador
+class PlayerSchedule:
+    __slots__ = ('puuid', 'last_activity', 'games_per_day', 'next_due')
+
+    def __init__(self, puuid, last_activity=None):
+        self.puuid = puuid
+        self.last_activity = last_activity  # timestamp (epoch) do fim da última partida conhecida
+        self.games_per_day = 0.0            # média móvel de partidas por dia
+        self.next_due = 0.0
+
+    # Registra uma nova partida e atualiza a frequência de jogo
+    def record_activity(self, timestamp):
+        if self.last_activity is not None and timestamp > self.last_activity:
+            gap_days = max((timestamp - self.last_activity) / 86400, 1 / 24)
+            self.games_per_day = 0.7 * self.games_per_day + 0.3 * (1 / gap_days)
+        if self.last_activity is None or timestamp > self.last_activity:
+            self.last_activity = timestamp
+
+    def interval(self, base, now):
+        if self.last_activity is None:
+            factor = 1.0
+        else:
+            idle = now - self.last_activity
+            factor = next((f for limit, f in IDLE_BACKOFF if idle < limit), IDLE_BACKOFF_MAX)
+            if self.games_per_day >= FREQUENT_PLAYER_GAMES_PER_DAY:
+                factor = min(factor, 1.0)
+        return max(MIN_POLL_INTERVAL, base * factor)
+
+
+# Agendador das verificações: fila de prioridade por horário, concorrência limitada
+# e verificações espalhadas ao longo do intervalo em vez de todas de uma vez
+class PollScheduler:
+    def __init__(self, poll, get_base_interval, concurrency=5, name="default"):
+        self.name = name
+        self.poll = poll                            # async poll(puuid) -> timestamp da nova partida ou None
+        self.get_base_interval = get_base_interval  # permite que /set_interval altere o ritmo em tempo real
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.players = {}
+        self.queue = []
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._tasks = set()
+        SCHEDULER_QUEUE_DEPTH.set_function(self.overdue, routing=name)
+        SCHEDULER_IN_FLIGHT.set_function(lambda: len(self._tasks), routing=name)
+
+    def _push(self, player, due):
+        player.next_due = due
+        heapq.heappush(self.queue, (due, next(self._counter), player.puuid))
+        self._wakeup.set()
+
+    # Adiciona vários jogadores distribuindo a primeira verificação ao longo do intervalo base.
+    # Com o estado salvo (snapshot), horários ainda no futuro são mantidos e só os atrasados
+    # são espalhados, começando por quem jogou mais recentemente. Sem snapshot, a última
+    # atividade vem de `last_activity` (puuid -> fim da última partida conhecida)
+    def add_many(self, puuids, state=None, last_activity=None):
+        state = state or {}
+        last_activity = last_activity or {}
+        now = time.time()
+        overdue = []
+        for puuid in puuids:
+            if puuid in self.players:
+                continue
+            player = PlayerSchedule(puuid, last_activity.get(puuid))
+            self.players[puuid] = player
+            saved = state.get(puuid)
+            if saved:
+                player.last_activity, player.games_per_day, due = saved
+                if due > now:
+                    self._push(player, due)
+                    continue
+            overdue.append(player)
+        if not overdue:
+            return
+        overdue.sort(key=lambda player: player.last_activity or 0, reverse=True)
+        spacing = self.get_base_interval() / len(overdue)
+        for i, player in enumerate(overdue):
+            self._push(player, now + i * spacing)
+
+    # Estado dos jogadores para o snapshot: puuid -> [última atividade, partidas por dia, próxima verificação]
+    def snapshot(self):
+        now = time.time()
+        return {
+            player.puuid: [player.last_activity, player.games_per_day, player.next_due if player.next_due != float('inf') else now]
+            for player in self.players.values()
+        }
+
+    # Jogadores com a verificação já vencida, esperando uma vaga (os em verificação têm next_due infinito)
+    def overdue(self):
+        now = time.time()
+        return sum(1 for player in self.players.values() if player.next_due <= now)
+
+    def add(self, puuid, last_activity=None):
+        if puuid in self.players:
+            return
+        player = PlayerSchedule(puuid, last_activity)
+        self.players[puuid] = player
+        self._push(player, time.time())
+
+    # Aplica um novo intervalo base aos jogadores na fila: quem estava agendado para depois do
+    # novo intervalo é trazido para dentro dele, espalhado para não verificar todos de uma vez
+    def reschedule(self):
+        now = time.time()
+        base = self.get_base_interval()
+        for player in self.players.values():
+            if player.next_due == float('inf'):
+                continue  # em verificação: o novo intervalo vale ao reagendar
+            interval = player.interval(base, now)
+            if player.next_due > now + interval:
+                self._push(player, now + random.uniform(0, interval))
+
+    def remove(self, puuid):
+        self.players.pop(puuid, None)
+
+    # Cancela as verificações em andamento e espera que terminem (o laço run() é cancelado por quem o criou)
+    async def stop(self):
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_one(self, player):
+        start = time.perf_counter()
+        result = "idle"
+        try:
+            activity = await self.poll(player.puuid)
+            if activity:
+                player.record_activity(activity)
+                result = "new_match"
+        except Exception as e:
+            logging.error(f"Erro ao monitorar o jogador {player.puuid}: {e}")
+            result = "error"
+        finally:
+            self.semaphore.release()
+            POLL_DURATION.observe(time.perf_counter() - start, routing=self.name)
+            POLLS.inc(routing=self.name, result=result)
+        if self.players.get(player.puuid) is player:
+            now = time.time()
+            interval = player.interval(self.get_base_interval(), now)
+            self._push(player, now + interval * random.uniform(0.9, 1.1))
+
+    async def run(self):
+        while True:
+            if not self.queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            due, _, puuid = self.queue[0]
+            player = self.players.get(puuid)
+            if player is None or player.next_due != due:
+                heapq.heappop(self.queue)  # entrada obsoleta (jogador removido ou reagendado)
+                continue
+
+            delay = due - time.time()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self.queue)
+            await self.semaphore.acquire()
+            if self.players.get(puuid) is not player or player.next_due != due:
+                self.semaphore.release()
+                continue
+            player.next_due = float('inf')  # em verificação
+            POLL_LAG.observe(max(0.0, time.time() - due), routing=self.name)
+            task = asyncio.create_task(self._run_one(player))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
@@ -0,0 +1,230 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    puuid TEXT PRIMARY KEY,
+    riot_id TEXT NOT NULL,
+    tagline TEXT NOT NULL,
+    platform TEXT NOT NULL DEFAULT 'br1',
+    routing TEXT NOT NULL DEFAULT 'americas',
+    registered_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_accounts_riot_id ON accounts (riot_id COLLATE NOCASE, tagline COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS last_matches (
+    puuid TEXT PRIMARY KEY,
+    match_id TEXT NOT NULL,
+    game_end REAL,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS config (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS match_results (
+    match_id TEXT NOT NULL,
+    puuid TEXT NOT NULL,
+    champion TEXT NOT NULL,
+    kills INTEGER NOT NULL,
+    deaths INTEGER NOT NULL,
+    assists INTEGER NOT NULL,
+    win INTEGER NOT NULL,
+    game_mode TEXT NOT NULL,
+    game_end REAL,
+    PRIMARY KEY (match_id, puuid)
+);
+CREATE INDEX IF NOT EXISTS idx_match_results_puuid ON match_results (puuid, game_end);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    saved_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS pending_notifications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel_id INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+);
+"""
+
+
+# Armazenamento persistente do bot em SQLite (modo WAL): contas, última partida
+# de cada jogador, configuração do canal e resumo das partidas anunciadas
+class Store:
+    def __init__(self, path='fofoquinhas.db'):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._upgrade_schema()
+        self.conn.commit()
+
+    # Adiciona colunas criadas depois da primeira versão do banco
+    def _upgrade_schema(self):
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(last_matches)")}
+        if 'game_end' not in columns:
+            self.conn.execute("ALTER TABLE last_matches ADD COLUMN game_end REAL")
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(accounts)")}
+        if 'platform' not in columns:
+            self.conn.execute("ALTER TABLE accounts ADD COLUMN platform TEXT NOT NULL DEFAULT 'br1'")
+        if 'routing' not in columns:
+            self.conn.execute("ALTER TABLE accounts ADD COLUMN routing TEXT NOT NULL DEFAULT 'americas'")
+
+    def close(self):
+        self.conn.close()
+
+    # Contas registradas
+    def load_accounts(self):
+        rows = self.conn.execute("SELECT puuid, riot_id, tagline, platform, routing FROM accounts")
+        return {row['puuid']: dict(row) for row in rows}
+
+    def add_account(self, puuid, riot_id, tagline, platform, routing):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO accounts (puuid, riot_id, tagline, platform, routing, registered_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (puuid) DO UPDATE SET riot_id = excluded.riot_id, tagline = excluded.tagline, "
+                "platform = excluded.platform, routing = excluded.routing",
+                (puuid, riot_id, tagline, platform, routing, time.time()),
+            )
+
+    def find_account(self, riot_id, tagline):
+        row = self.conn.execute(
+            "SELECT puuid, riot_id, tagline, platform, routing FROM accounts "
+            "WHERE riot_id = ? COLLATE NOCASE AND tagline = ? COLLATE NOCASE",
+            (riot_id, tagline),
+        ).fetchone()
+        return dict(row) if row else None
+
+    # Cursor de partidas de cada jogador: última partida vista e quando ela terminou
+    def load_last_matches(self):
+        rows = self.conn.execute("SELECT puuid, match_id, game_end FROM last_matches")
+        return {row['puuid']: {'match_id': row['match_id'], 'game_end': row['game_end']} for row in rows}
+
+    def set_last_match(self, puuid, match_id, game_end=None):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO last_matches (puuid, match_id, game_end, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (puuid) DO UPDATE SET match_id = excluded.match_id, "
+                "game_end = excluded.game_end, updated_at = excluded.updated_at",
+                (puuid, match_id, game_end, time.time()),
+            )
+
+    # Configuração (canal de notificações, intervalo etc.)
+    def get_config(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM config WHERE key = ?", (key,)).fetchone()
+        return json.loads(row['value']) if row else default
+
+    def set_config(self, key, value):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO config (key, value) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, json.dumps(value)),
+            )
+
+    # Resumo das partidas anunciadas (um registro por jogador registrado na partida)
+    def add_match_results(self, match_summary, puuids):
+        rows = []
+        for puuid in puuids:
+            participant = match_summary.participant(puuid)
+            if participant is None:
+                continue
+            rows.append((
+                match_summary.match_id, puuid, participant.champion_name, participant.kills, participant.deaths,
+                participant.assists, int(participant.win), match_summary.game_mode, match_summary.game_end,
+            ))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO match_results "
+                "(match_id, puuid, champion, kills, deaths, assists, win, game_mode, game_end) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def match_announced(self, match_id):
+        row = self.conn.execute("SELECT 1 FROM match_results WHERE match_id = ? LIMIT 1", (match_id,)).fetchone()
+        return row is not None
+
+    # Snapshot do estado em memória (agendadores, cache de partidas) para reinícios rápidos
+    def save_snapshot(self, name, data):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO snapshots (name, data, saved_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET data = excluded.data, saved_at = excluded.saved_at",
+                (name, json.dumps(data), time.time()),
+            )
+
+    def load_snapshot(self, name):
+        row = self.conn.execute("SELECT data FROM snapshots WHERE name = ?", (name,)).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def delete_snapshot(self, name):
+        with self.conn:
+            self.conn.execute("DELETE FROM snapshots WHERE name = ?", (name,))
+
+    # Fila de notificações ainda não entregues ao Discord
+    def add_notification(self, channel_id, payload):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO pending_notifications (channel_id, payload, created_at) VALUES (?, ?, ?)",
+                (channel_id, payload, time.time()),
+            )
+
+    # Notificações pendentes mais antigas, ignorando os canais informados (ex.: em espera após falha)
+    def pending_notifications(self, limit=100, exclude_channels=()):
+        exclude_channels = list(exclude_channels)
+        placeholders = ", ".join("?" for _ in exclude_channels)
+        rows = self.conn.execute(
+            "SELECT id, channel_id, payload, attempts, created_at FROM pending_notifications "
+            f"WHERE channel_id NOT IN ({placeholders}) ORDER BY id LIMIT ?",
+            (*exclude_channels, limit),
+        )
+        return [dict(row) for row in rows]
+
+    def count_notifications(self):
+        return self.conn.execute("SELECT COUNT(*) FROM pending_notifications").fetchone()[0]
+
+    def delete_notifications(self, ids):
+        with self.conn:
+            self.conn.executemany("DELETE FROM pending_notifications WHERE id = ?", [(i,) for i in ids])
+
+    # Incrementa as tentativas e retorna o maior número de tentativas entre as notificações
+    def mark_notifications_failed(self, ids):
+        with self.conn:
+            self.conn.executemany("UPDATE pending_notifications SET attempts = attempts + 1 WHERE id = ?", [(i,) for i in ids])
+        placeholders = ", ".join("?" for _ in ids)
+        row = self.conn.execute(f"SELECT MAX(attempts) FROM pending_notifications WHERE id IN ({placeholders})", ids).fetchone()
+        return row[0] or 0
+
+    # Migra os arquivos JSON antigos na primeira inicialização
+    def migrate_json(self, accounts_path='registered_accounts.json', channel_path='notification_channel.json'):
+        if self.get_config('json_migrated'):
+            return
+        if os.path.exists(accounts_path):
+            with open(accounts_path, 'r') as file:
+                accounts = json.load(file)
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO accounts (puuid, riot_id, tagline, registered_at) VALUES (?, ?, ?, ?)",
+                    [(puuid, account['riot_id'], account['tagline'], time.time()) for puuid, account in accounts.items()],
+                )
+            # Contas migradas não têm cursor: a última partida delas é registrada sem anúncio
+            self.set_config('migrated_accounts', list(accounts))
+            logging.info(f"{len(accounts)} contas migradas de {accounts_path}")
+        if os.path.exists(channel_path):
+            with open(channel_path, 'r') as file:
+                channel_id = json.load(file)
+            if channel_id is not None and self.get_config('notification_channel_id') is None:
+                self.set_config('notification_channel_id', channel_id)
+        self.set_config('json_migrated', True)
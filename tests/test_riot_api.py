@@ -0,0 +1,79 @@
+import math
+import random
+from riot_api import RATE_LIMIT_SAFETY, RateLimit, SlidingWindow
+
+
+# Envia o mais rápido que o limitador permitir, com um relógio falso, e devolve os horários dos envios
+def send_greedily(rate_limit, duration, jitter=0.0):
+    now = 0.0
+    sent = []
+    while now < duration:
+        wait = rate_limit.wait_time(now)
+        if wait > 0:
+            now += wait + random.uniform(0, jitter)
+            continue
+        rate_limit.consume(now)
+        sent.append(now)
+        now += random.uniform(0, jitter)
+    return sent
+
+
+# Maior contagem de um contador de janela fixa (como o da Riot), testando vários inícios de janela
+def max_fixed_window_count(sent, window, offsets=50):
+    worst = 0
+    for i in range(offsets):
+        offset = window * i / offsets
+        counts = {}
+        for t in sent:
+            key = math.floor((t - offset) / window)
+            counts[key] = counts.get(key, 0) + 1
+        worst = max(worst, max(counts.values()))
+    return worst
+
+
+def test_never_exceeds_any_fixed_window():
+    random.seed(1)
+    for jitter in (0.0, 0.01, 0.5):
+        rate_limit = RateLimit("20:1,100:120")
+        sent = send_greedily(rate_limit, duration=600, jitter=jitter)
+        assert max_fixed_window_count(sent, 1) <= int(20 * RATE_LIMIT_SAFETY)
+        assert max_fixed_window_count(sent, 120) <= int(100 * RATE_LIMIT_SAFETY)
+
+
+def test_uses_the_whole_window():
+    rate_limit = RateLimit("100:120")
+    sent = send_greedily(rate_limit, duration=240)
+    # Uma rajada por janela: 90 envios em t=0 e mais 90 em t=120
+    assert len(sent) == 2 * int(100 * RATE_LIMIT_SAFETY)
+
+
+def test_sync_at_capacity_blocks_for_a_full_window():
+    window = SlidingWindow(100, 120)
+    window.sync(100, now=10.0)
+    assert window.wait_time(10.0) == 120
+    assert window.wait_time(129.9) > 0
+    assert window.wait_time(130.0) == 0
+
+
+def test_sync_counts_sends_we_did_not_see():
+    window = SlidingWindow(100, 120)
+    for t in range(10):
+        window.consume(float(t))
+    window.sync(50, now=10.0)
+    assert len(window.sent) == 50
+    window.sync(5, now=11.0)
+    assert len(window.sent) == 50
+
+
+def test_block_waits_for_retry_after():
+    window = SlidingWindow(20, 1)
+    window.block(7, now=3.0)
+    assert window.wait_time(3.0) == 7
+    assert window.wait_time(10.0) == 0
+
+
+def test_update_drops_windows_no_longer_reported():
+    rate_limit = RateLimit("20:1,100:120")
+    rate_limit.update("500:10,30000:600", "1:10,1:600", now=0.0)
+    assert sorted(rate_limit.windows) == [10, 600]
+    assert rate_limit.windows[10].capacity == int(500 * RATE_LIMIT_SAFETY)